@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+SQLite store for on-demand game analyses.
+
+Each analysis is one row keyed by (PGN key, depth), so saving a game is a
+small transactional insert instead of a rewrite of the whole cache file.
+The database runs in WAL mode, which lets readers work while one writer
+commits.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from json_io import dumps_json, loads_json
+
+
+def pgn_key(pgn: str) -> str:
+    """Content key for a game's PGN, used to cache its analyses."""
+    return hashlib.sha1(pgn.strip().encode()).hexdigest()[:16]
+
+
+class AnalysisStore:
+    """Analyses of games, keyed by PGN content key and engine depth."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open (and create if needed) the analysis database.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS analysis ("
+            " key TEXT NOT NULL,"
+            " depth INTEGER NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " PRIMARY KEY (key, depth))"
+        )
+        self.db.commit()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+
+    def get(self, key: str, min_depth: int = 0) -> Optional[Dict]:
+        """
+        Return the deepest analysis of a game searched to at least min_depth.
+
+        Args:
+            key: PGN content key
+            min_depth: Minimum engine depth
+
+        Returns:
+            Analysis, or None if nothing deep enough is stored
+        """
+        row = self.db.execute(
+            "SELECT payload FROM analysis WHERE key = ? AND depth >= ?"
+            " ORDER BY depth DESC LIMIT 1",
+            (key, min_depth)
+        ).fetchone()
+        return loads_json(row[0]) if row else None
+
+    def put(self, key: str, depth: int, analysis: Dict):
+        """Store one analysis, replacing any earlier one at the same depth."""
+        self.put_many([(key, depth, analysis)])
+
+    def put_many(self, entries: Iterable[Tuple[str, int, Dict]]):
+        """Store several analyses in a single transaction."""
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO analysis (key, depth, payload) VALUES (?, ?, ?)",
+                ((key, depth, dumps_json(analysis)) for key, depth, analysis in entries)
+            )
+
+    def export(self, urls: Dict[str, str]) -> Dict[str, Dict]:
+        """
+        Return the deepest analysis of each game as {url: analysis}.
+
+        This is the layout of the original detailed_analysis_cache.json:
+        keyed by game URL, each analysis carrying its own engine_depth.
+
+        Args:
+            urls: Game URL for each PGN key; analyses of other games are skipped
+
+        Returns:
+            Analyses keyed by game URL
+        """
+        cache = {}
+        # Rows come shallowest first, so the deepest analysis is kept
+        for key, payload in self.db.execute(
+                "SELECT key, payload FROM analysis ORDER BY key, depth"):
+            url = urls.get(key)
+            if url:
+                cache[url] = loads_json(payload)
+        return cache
+
+    def close(self):
+        """Close the database connection."""
+        self.db.close()
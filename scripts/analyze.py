@@ -9,12 +9,65 @@ This script analyzes the fetched games to extract insights like:
 - Strengths and weaknesses
 """
 
-import json
+import argparse
 import os
-from collections import defaultdict, Counter
+import re
+import sys
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from json_io import dump_json, load_json
+
+try:
+    import ijson  # Optional: lets large caches be streamed game by game
+except ImportError:
+    ijson = None
+
+# Bump when the analysis output changes so saved results are regenerated
+ANALYZER_VERSION = 1
+ANALYSIS_FILE = "data/analysis_results.json"
+
+# Result -> stats bucket field it increments ("unknown" has none)
+_RESULT_FIELDS = {"win": "wins", "loss": "losses", "draw": "draws"}
+_OPPONENT_COLOR = {"white": "black", "black": "white"}
+
+# Shared read-only default for missing player dicts, so lookups don't allocate
+_EMPTY = {}
+
+
+def _build_opening_trie(patterns: Dict[str, str]) -> Dict:
+    """Build a trie of SAN tokens; nodes carry the opening name under "_name"."""
+    trie = {}
+    for pattern, name in patterns.items():
+        node = trie
+        for move in pattern.split():
+            node = node.setdefault(move, {})
+        node["_name"] = name
+    return trie
+
+
+def _tally(buckets: Dict[str, Dict], key: str, result: str, count: int):
+    """Add `count` games with the given result to the stats bucket for `key`."""
+    stats = buckets.get(key)
+    if stats is None:
+        stats = buckets[key] = {"wins": 0, "losses": 0, "draws": 0, "total": 0}
+
+    stats["total"] += count
+    field = _RESULT_FIELDS.get(result)
+    if field:
+        stats[field] += count
+
+
+def _add_rates(buckets: Dict[str, Dict], loss_rate: bool = False):
+    """Add win (and optionally loss) percentages to wins/losses/draws buckets."""
+    for stats in buckets.values():
+        total = stats["total"]
+        if total > 0:
+            stats["win_rate"] = round(stats["wins"] / total * 100, 1)
+            if loss_rate:
+                stats["loss_rate"] = round(stats["losses"] / total * 100, 1)
 
 
 class ChessAnalyzer:
@@ -41,6 +94,37 @@ class ChessAnalyzer:
         "d4 Nf6 c4 g6": "King's Indian",
         "d4 Nf6 c4 e6": "Nimzo/Queen's Indian",
     }
+    OPENING_TRIE = _build_opening_trie(OPENING_PATTERNS)
+
+    # PGN tag pairs, and SAN moves (check/mate suffix dropped) outside comments
+    PGN_TAG_RE = re.compile(r'\[(\w+)\s+"([^"]*)"\]')
+    PGN_MOVE_RE = re.compile(
+        r'\{[^}]*\}|(O-O(?:-O)?|[KQRBN]?[a-h]?[1-8]?x?[a-h][1-8](?:=[QRBN])?)'
+    )
+
+    # Chess.com result codes, from the perspective of the player they belong to
+    RESULT_OUTCOMES = {
+        "win": "win",
+        "agreed": "draw",
+        "repetition": "draw",
+        "stalemate": "draw",
+        "insufficient": "draw",
+        "50move": "draw",
+        "timevsinsufficient": "draw",
+        "resigned": "loss",
+        "timeout": "loss",
+        "checkmated": "loss",
+        "abandoned": "loss",
+        "lose": "loss",
+        "threecheck": "loss",
+        "kingofthehill": "loss",
+        "bughousepartnerlose": "loss",
+    }
+
+    # Only these fields are read during analysis; everything else in the
+    # cache (tcn, fen, accuracies, ...) is dropped at load time.
+    GAME_FIELDS = ("url", "pgn", "time_class", "end_time")
+    PLAYER_FIELDS = ("username", "rating", "result")
 
     def __init__(self, cache_file: str = "data/games_cache.json"):
         """
@@ -51,6 +135,7 @@ class ChessAnalyzer:
         """
         self.cache_file = Path(cache_file)
         self.games = []
+        self._features = []  # Per-game feature rows, built once by load_games
         self.username = ""
         self.load_games()
 
@@ -59,48 +144,107 @@ class ChessAnalyzer:
         if not self.cache_file.exists():
             raise FileNotFoundError(f"Cache file not found: {self.cache_file}")
 
-        with open(self.cache_file, 'r') as f:
-            data = json.load(f)
+        if ijson is not None:
+            username, games = self._stream_cache()
+        else:
+            data = load_json(self.cache_file)
+            username = data.get("username", "")
+            games = [self._slim_game(game) for game in data.get("games", [])]
 
-        self.username = data.get("username", "").lower()
-        self.games = data.get("games", [])
+        self.username = username.lower()
+        self.games = [self._annotate_game(game) for game in games]
+        self._features = list(self._iter_game_features())
         print(f"Loaded {len(self.games)} games for {self.username}")
 
+    def _stream_cache(self) -> Tuple[str, List[Dict]]:
+        """
+        Stream the cache with ijson, decoding only the fields the analysis reads.
+
+        Unused game fields (tcn, fen, accuracies, ...) are skipped at the
+        parser-event level, so they never become Python objects.
+
+        Returns:
+            Tuple of (username, slim game records)
+        """
+        game_fields = {f"games.item.{field}": field for field in self.GAME_FIELDS}
+        player_fields = {
+            f"games.item.{color}.{field}": (color, field)
+            for color in ("white", "black")
+            for field in self.PLAYER_FIELDS
+        }
+
+        username = ""
+        games = []
+        game = None
+        with open(self.cache_file, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == "games.item":
+                    if event == "start_map":
+                        game = {}
+                    elif event == "end_map":
+                        games.append(game)
+                elif prefix in game_fields:
+                    game[game_fields[prefix]] = value
+                elif prefix in player_fields:
+                    color, field = player_fields[prefix]
+                    game.setdefault(color, {})[field] = value
+                elif prefix == "username" and event == "string":
+                    username = value
+
+        return username, games
+
+    def _slim_game(self, game: Dict) -> Dict:
+        """Keep only the fields used by the analysis."""
+        slim = {field: game[field] for field in self.GAME_FIELDS if field in game}
+        for color in ("white", "black"):
+            player = game.get(color)
+            if player is not None:
+                slim[color] = {field: player[field] for field in self.PLAYER_FIELDS if field in player}
+        return slim
+
+    def _annotate_game(self, game: Dict) -> Dict:
+        """Attach the player's color, result and opening so each is computed once."""
+        color = self.get_player_color(game)
+        game["_color"] = color
+        game["_result"] = self.get_game_result(game, color)
+        # Interned so repeated names share one object and hash/compare by identity
+        game["_opening"] = sys.intern(self.get_opening(game)) if color != "unknown" else None
+        return game
+
     def get_player_color(self, game: Dict) -> str:
         """Determine if player was white or black in a game."""
-        white_player = game.get("white", {}).get("username", "").lower()
-        black_player = game.get("black", {}).get("username", "").lower()
-
-        if white_player == self.username:
+        username = self.username
+        if game.get("white", _EMPTY).get("username", "").lower() == username:
             return "white"
-        elif black_player == self.username:
+        elif game.get("black", _EMPTY).get("username", "").lower() == username:
             return "black"
         return "unknown"
 
-    def get_game_result(self, game: Dict) -> str:
+    def get_game_result(self, game: Dict, color: Optional[str] = None) -> str:
         """Get game result from player's perspective."""
-        color = self.get_player_color(game)
+        if color is None:
+            color = self.get_player_color(game)
         if color == "unknown":
             return "unknown"
 
-        player_data = game.get(color, {})
-        opponent_data = game.get("white" if color == "black" else "black", {})
+        player_data = game.get(color, _EMPTY)
+        opponent_data = game.get(_OPPONENT_COLOR[color], _EMPTY)
 
         player_result = player_data.get("result", "")
         opponent_result = opponent_data.get("result", "")
 
-        if "win" in player_result:
+        outcome = self.RESULT_OUTCOMES.get(player_result)
+        opponent_outcome = self.RESULT_OUTCOMES.get(opponent_result)
+
+        if outcome == "win":
             return "win"
-        elif "win" in opponent_result:
-            return "loss"
-        elif "agreed" in player_result or "repetition" in player_result or "insufficient" in player_result:
-            return "draw"
-        elif player_result in ["resigned", "timeout", "checkmated", "abandoned"]:
+        elif opponent_outcome == "win":
             return "loss"
-        elif opponent_result in ["resigned", "timeout", "checkmated", "abandoned"]:
+        elif outcome is not None:
+            return outcome
+        elif opponent_outcome == "loss":
             return "win"
-        else:
-            return "draw"
+        return "draw"
 
     def get_opening(self, game: Dict) -> str:
         """Extract opening from PGN or moves."""
@@ -108,187 +252,185 @@ class ChessAnalyzer:
         if not pgn:
             return "Unknown"
 
-        # Try to get ECO code from PGN headers
-        if "[ECO " in pgn:
-            eco_start = pgn.index("[ECO ") + 5
-            eco_end = pgn.index("]", eco_start)
-            eco_code = pgn[eco_start:eco_end].strip('"')
-            if eco_code:
-                return f"ECO {eco_code}"
-
-        # Try to get opening name from PGN headers
-        if "[Opening " in pgn:
-            opening_start = pgn.index("[Opening ") + 9
-            opening_end = pgn.index("]", opening_start)
-            opening_name = pgn[opening_start:opening_end].strip('"')
-            if opening_name:
-                return opening_name
-
-        # Extract first moves and match patterns
-        moves_start = pgn.rfind("]") + 1
-        moves_text = pgn[moves_start:].strip()
-
-        # Parse moves (simplified)
-        moves = []
-        for token in moves_text.split():
-            if not token[0].isdigit() and not token.startswith("{") and token != "*":
-                moves.append(token.split("+")[0].split("#")[0])  # Remove check/mate symbols
-                if len(moves) >= 6:  # Look at first 3 full moves
-                    break
-
-        # Match against known patterns (longest first)
-        moves_str = " ".join(moves)
-        for pattern_length in [5, 4, 3, 2, 1]:
-            test_pattern = " ".join(moves[:pattern_length])
-            if test_pattern in self.OPENING_PATTERNS:
-                return self.OPENING_PATTERNS[test_pattern]
+        # Read the opening from the PGN headers in one scan, preferring the
+        # descriptive Opening name over the ECO code
+        eco_code = None
+        headers_end = 0
+        for match in self.PGN_TAG_RE.finditer(pgn):
+            tag, value = match.groups()
+            if tag == "Opening" and value:
+                return value
+            if tag == "ECO" and value and eco_code is None:
+                eco_code = value
+            headers_end = match.end()
+
+        if eco_code:
+            return f"ECO {eco_code}"
+
+        # Read moves from the movetext (skipping {comments}) while walking the
+        # opening trie; stop as soon as no longer pattern can match
+        node = self.OPENING_TRIE
+        opening_name = None
+        first_move = None
+        for match in self.PGN_MOVE_RE.finditer(pgn, headers_end):
+            move = match.group(1)
+            if not move:
+                continue
+            if first_move is None:
+                first_move = move
+            node = node.get(move)
+            if node is None:
+                break
+            opening_name = node.get("_name", opening_name)
+
+        if opening_name:
+            return opening_name
 
         # Default based on first move
-        if moves:
-            return f"1. {moves[0]}"
+        if first_move:
+            return f"1. {first_move}"
         return "Unknown"
 
-    def analyze_openings(self) -> Dict:
-        """Analyze opening repertoire and success rates."""
-        openings_white = defaultdict(lambda: {"wins": 0, "losses": 0, "draws": 0, "total": 0})
-        openings_black = defaultdict(lambda: {"wins": 0, "losses": 0, "draws": 0, "total": 0})
-
-        for game in self.games:
-            color = self.get_player_color(game)
-            result = self.get_game_result(game)
-            opening = self.get_opening(game)
-
-            if color == "white":
-                openings_white[opening]["total"] += 1
-                if result == "win":
-                    openings_white[opening]["wins"] += 1
-                elif result == "loss":
-                    openings_white[opening]["losses"] += 1
-                elif result == "draw":
-                    openings_white[opening]["draws"] += 1
-            elif color == "black":
-                openings_black[opening]["total"] += 1
-                if result == "win":
-                    openings_black[opening]["wins"] += 1
-                elif result == "loss":
-                    openings_black[opening]["losses"] += 1
-                elif result == "draw":
-                    openings_black[opening]["draws"] += 1
-
-        # Calculate win rates
-        for openings in [openings_white, openings_black]:
-            for opening_data in openings.values():
-                total = opening_data["total"]
-                if total > 0:
-                    opening_data["win_rate"] = round(opening_data["wins"] / total * 100, 1)
-                    opening_data["loss_rate"] = round(opening_data["losses"] / total * 100, 1)
-
-        return {
-            "white": dict(openings_white),
-            "black": dict(openings_black)
-        }
-
-    def analyze_time_controls(self) -> Dict:
-        """Analyze performance by time control."""
-        time_controls = defaultdict(lambda: {"wins": 0, "losses": 0, "draws": 0, "total": 0})
+    def _iter_game_features(self) -> Iterator[Tuple]:
+        """
+        Yield the per-game values the analysis needs, each computed once.
 
+        Yields:
+            (color, result, opening, time_class, end_time, result_reason, rating, url)
+        """
         for game in self.games:
-            tc = game.get("time_class", "unknown")
-            result = self.get_game_result(game)
+            color = game["_color"]
+            time_class = sys.intern(game.get("time_class", "unknown"))
+            end_time = game.get("end_time", 0)
+            url = game.get("url", "")
 
-            time_controls[tc]["total"] += 1
-            if result == "win":
-                time_controls[tc]["wins"] += 1
-            elif result == "loss":
-                time_controls[tc]["losses"] += 1
-            elif result == "draw":
-                time_controls[tc]["draws"] += 1
-
-        # Calculate win rates
-        for tc_data in time_controls.values():
-            total = tc_data["total"]
-            if total > 0:
-                tc_data["win_rate"] = round(tc_data["wins"] / total * 100, 1)
-
-        return dict(time_controls)
-
-    def analyze_time_usage(self) -> Dict:
-        """Analyze time management patterns."""
-        time_pressure_games = []
-        endings = Counter()
+            if color == "unknown":
+                yield color, "unknown", None, time_class, end_time, "", None, url
+                continue
 
-        for game in self.games:
-            color = self.get_player_color(game)
+            player_data = game.get(color, _EMPTY)
+            yield (
+                color,
+                game["_result"],
+                game["_opening"],
+                time_class,
+                end_time,
+                sys.intern(player_data.get("result", "")),
+                player_data.get("rating"),
+                url,
+            )
+
+    def _aggregate(self) -> Dict:
+        """Compute opening, time control, time usage and rating stats in one pass."""
+        # Per-game keys are collected in flat lists and counted in bulk after the loop
+        opening_keys = []  # (color, opening, result)
+        tc_keys = []  # (time class, result)
+        ending_reasons = []
+        timeouts = 0
+        timeout_games = []  # First few timeouts, kept as examples
+        latest_ratings = {}  # time class -> (end_time, rating) of its most recent game
+        first_rated = {}  # time class -> end_time of its oldest rated game
+        rated_games = 0
+
+        for color, result, opening, tc, end_time, result_reason, rating, url in self._features:
+            tc_keys.append((tc, result))
             if color == "unknown":
                 continue
 
-            # Check for time pressure (simplified - would need move times for accurate analysis)
-            player_data = game.get(color, {})
-            result_reason = player_data.get("result", "")
+            opening_keys.append((color, opening, result))
 
+            # Check for time pressure (simplified - would need move times for accurate analysis)
             if "timeout" in result_reason:
-                time_pressure_games.append({
-                    "url": game.get("url", ""),
-                    "result": "lost on time",
-                    "time_control": game.get("time_class", "unknown")
-                })
+                timeouts += 1
+                if len(timeout_games) < 5:
+                    timeout_games.append({
+                        "url": url,
+                        "result": "lost on time",
+                        "time_control": tc
+                    })
 
             # Track ending types
             if result_reason:
-                endings[result_reason] += 1
+                ending_reasons.append(result_reason)
+
+            if rating:
+                rated_games += 1
+                # ">=" keeps the later-listed game on equal timestamps, like a stable sort
+                if tc not in latest_ratings or end_time >= latest_ratings[tc][0]:
+                    latest_ratings[tc] = (end_time, rating)
+                if tc not in first_rated or end_time < first_rated[tc]:
+                    first_rated[tc] = end_time
+
+        endings = Counter(ending_reasons)
+
+        # Expand the flat counts into per-opening / per-time-control stats
+        openings = {"white": {}, "black": {}}
+        for (color, opening, result), count in Counter(opening_keys).items():
+            _tally(openings[color], opening, result, count)
+
+        time_controls = {}
+        for (tc, result), count in Counter(tc_keys).items():
+            _tally(time_controls, tc, result, count)
+
+        # Calculate win rates once per bucket, after all games are counted
+        _add_rates(openings["white"], loss_rate=True)
+        _add_rates(openings["black"], loss_rate=True)
+        _add_rates(time_controls)
+
+        # Current ratings come from the most recent game of each time control,
+        # listed in the order the time controls were first played
+        current_ratings = {
+            tc: latest_ratings[tc][1]
+            for tc in sorted(latest_ratings, key=first_rated.get)
+        }
 
         return {
-            "timeouts": len(time_pressure_games),
-            "timeout_games": time_pressure_games[:5],  # Show only first 5
-            "ending_types": dict(endings.most_common(10))
+            "openings": openings,
+            "time_controls": time_controls,
+            "time_usage": {
+                "timeouts": timeouts,
+                "timeout_games": timeout_games,
+                "ending_types": dict(endings.most_common(10))
+            },
+            "rating_progress": {
+                "current_ratings": current_ratings,
+                "total_games_tracked": rated_games
+            }
         }
 
-    def analyze_rating_progress(self) -> Dict:
-        """Analyze rating changes over time."""
-        rating_history = []
+    def analyze_openings(self) -> Dict:
+        """Analyze opening repertoire and success rates."""
+        return self._aggregate()["openings"]
 
-        for game in sorted(self.games, key=lambda g: g.get("end_time", 0)):
-            color = self.get_player_color(game)
-            if color == "unknown":
-                continue
+    def analyze_time_controls(self) -> Dict:
+        """Analyze performance by time control."""
+        return self._aggregate()["time_controls"]
 
-            player_data = game.get(color, {})
-            rating = player_data.get("rating")
-            if rating:
-                timestamp = game.get("end_time", 0)
-                date = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d") if timestamp else "unknown"
-                rating_history.append({
-                    "date": date,
-                    "rating": rating,
-                    "time_control": game.get("time_class", "unknown")
-                })
-
-        # Group by time control
-        by_time_control = defaultdict(list)
-        for entry in rating_history:
-            tc = entry["time_control"]
-            by_time_control[tc].append({
-                "date": entry["date"],
-                "rating": entry["rating"]
-            })
+    def analyze_time_usage(self) -> Dict:
+        """Analyze time management patterns."""
+        return self._aggregate()["time_usage"]
 
-        # Get current ratings (last games)
-        current_ratings = {}
-        for tc, history in by_time_control.items():
-            if history:
-                current_ratings[tc] = history[-1]["rating"]
+    def analyze_rating_progress(self) -> Dict:
+        """Analyze rating changes over time."""
+        return self._aggregate()["rating_progress"]
 
-        return {
-            "current_ratings": current_ratings,
-            "total_games_tracked": len(rating_history)
-        }
+    def find_weaknesses(self, openings: Optional[Dict] = None,
+                        time_analysis: Optional[Dict] = None) -> Dict:
+        """
+        Identify potential weaknesses and areas for improvement.
 
-    def find_weaknesses(self) -> Dict:
-        """Identify potential weaknesses and areas for improvement."""
+        Args:
+            openings: Precomputed opening stats (computed if omitted)
+            time_analysis: Precomputed time usage stats (computed if omitted)
+        """
         weaknesses = []
 
-        # Analyze openings
-        openings = self.analyze_openings()
+        if openings is None or time_analysis is None:
+            aggregate = self._aggregate()
+            if openings is None:
+                openings = aggregate["openings"]
+            if time_analysis is None:
+                time_analysis = aggregate["time_usage"]
 
         # Find problematic openings as white
         for opening, stats in openings["white"].items():
@@ -315,7 +457,6 @@ class ChessAnalyzer:
                     })
 
         # Check time management
-        time_analysis = self.analyze_time_usage()
         timeout_rate = (time_analysis["timeouts"] / len(self.games) * 100) if self.games else 0
         if timeout_rate > 5:
             weaknesses.append({
@@ -335,37 +476,78 @@ class ChessAnalyzer:
         """Generate complete analysis."""
         print("Analyzing games...")
 
+        stats = self._aggregate()
         analysis = {
             "username": self.username,
             "total_games": len(self.games),
             "analysis_date": datetime.now().isoformat(),
-            "openings": self.analyze_openings(),
-            "time_controls": self.analyze_time_controls(),
-            "time_usage": self.analyze_time_usage(),
-            "rating_progress": self.analyze_rating_progress(),
-            "weaknesses": self.find_weaknesses()
+            "openings": stats["openings"],
+            "time_controls": stats["time_controls"],
+            "time_usage": stats["time_usage"],
+            "rating_progress": stats["rating_progress"],
+            "weaknesses": self.find_weaknesses(stats["openings"], stats["time_usage"])
         }
 
+        analysis["_cache_signature"] = cache_signature(self.cache_file)
+
         # Save analysis
-        output_file = Path("data/analysis_results.json")
-        with open(output_file, 'w') as f:
-            json.dump(analysis, f, indent=2)
+        output_file = Path(ANALYSIS_FILE)
+        dump_json(analysis, output_file)
 
         print(f"Analysis saved to: {output_file}")
         return analysis
 
 
+def cache_signature(cache_file: Path) -> List:
+    """Identify a cache file's contents and the analyzer version that reads it."""
+    stat = cache_file.stat()
+    return [stat.st_mtime_ns, stat.st_size, ANALYZER_VERSION]
+
+
+def load_cached_analysis(cache_file: Path, output_file: Path) -> Optional[Dict]:
+    """
+    Load a previous analysis if it was generated from the current cache file.
+
+    Args:
+        cache_file: Path to games cache file
+        output_file: Path to saved analysis results
+
+    Returns:
+        Saved analysis, or None if missing or out of date
+    """
+    try:
+        analysis = load_json(output_file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if analysis.get("_cache_signature") != cache_signature(cache_file):
+        return None
+    return analysis
+
+
 def main():
     """Main function to run the analyzer."""
+    parser = argparse.ArgumentParser(description="Analyze cached chess games")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run the analysis even if the games cache is unchanged"
+    )
+    args = parser.parse_args()
+
     # Check if cache file exists
-    cache_file = "data/games_cache.json"
-    if not Path(cache_file).exists():
+    cache_file = Path("data/games_cache.json")
+    if not cache_file.exists():
         print(f"Error: {cache_file} not found. Run fetch_games.py first.")
         return
 
-    # Run analysis
-    analyzer = ChessAnalyzer(cache_file)
-    analysis = analyzer.generate_analysis()
+    # Reuse the saved analysis when the cache has not changed since it was made
+    analysis = None if args.force else load_cached_analysis(cache_file, Path(ANALYSIS_FILE))
+    if analysis is not None:
+        print(f"Games cache unchanged, using existing {ANALYSIS_FILE} (--force to re-run)")
+    else:
+        analyzer = ChessAnalyzer(cache_file)
+        analysis = analyzer.generate_analysis()
 
     # Print summary
     print("\n" + "=" * 50)
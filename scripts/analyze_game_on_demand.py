@@ -8,48 +8,219 @@ when requested from TypingMind chat.
 
 import os
 import sys
-import json
+import heapq
+import atexit
+import shutil
 import chess
 import chess.engine
 import chess.pgn
+import chess.polyglot
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import repeat
 from io import StringIO
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from typing import Dict, Optional, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
+
+from analysis_store import AnalysisStore, pgn_key
+from json_io import dumps_json, load_json
+
+# Move classes listed under "Critical Moments" in the report
+CRITICAL_CLASSES = frozenset(("blunder", "mistake"))
+
+
+# Stockfish instance owned by a parallel analysis worker process
+_worker_engine = None
+
+
+def _init_worker(engine_path: str, options: Dict):
+    """Start one Stockfish per worker process."""
+    global _worker_engine
+    _worker_engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+    _worker_engine.configure(options)
+    # Worker processes skip atexit handlers but run multiprocessing finalizers
+    Finalize(None, _worker_engine.quit, exitpriority=10)
+
+
+def _analyse_position(task: Tuple[str, List[str], int]) -> Tuple:
+    """Evaluate the position reached by playing the given moves from fen."""
+    fen, ucis, depth = task
+    board = chess.Board(fen)
+    # The moves come from a parsed game, so skip push_uci's legality check
+    for uci in ucis:
+        board.push(chess.Move.from_uci(uci))
+    return _evaluation(_worker_engine.analyse(board, chess.engine.Limit(depth=depth)))
+
+
+class _MainlineBuilder(chess.pgn.BoardBuilder):
+    """
+    Parse only a game's mainline onto a board, without building a Game tree.
+
+    Like the default GameBuilder, an illegal move is logged and ends the
+    mainline instead of raising.
+    """
+
+    def handle_error(self, error: Exception) -> None:
+        chess.pgn.LOGGER.error("%s while parsing PGN", error)
+
+
+def _evaluation(info: Dict) -> Tuple:
+    """Extract the White-POV score and best move from an engine info dict."""
+    pv = info.get("pv")
+    return info["score"].white(), pv[0] if pv else None
 
 
 class OnDemandAnalyzer:
     """Analyze specific chess games on request."""
 
+    # Try to use local Stockfish - check multiple locations
+    ENGINE_PATHS = [
+        "/opt/homebrew/bin/stockfish",  # Homebrew on Apple Silicon
+        "/usr/local/bin/stockfish",      # Homebrew on Intel Mac
+        "/usr/bin/stockfish",            # Linux
+        "stockfish"                      # In PATH
+    ]
+
+    # Positions are spread over single-threaded Stockfish workers, one per
+    # core; every worker holds its own hash table, so the cap bounds memory
+    MAX_WORKERS = 8
+    WORKER_ENGINE_OPTIONS = {"Hash": 128, "Threads": 1}
+    # Only for the single-engine fallback on one-CPU machines
+    ENGINE_OPTIONS = {"Hash": 256}
+
+    # Move classes from best to worst (Lichess style); CLASS_THRESHOLDS holds the
+    # smallest centipawn loss of each class after the first
+    MOVE_CLASSES = ("best", "excellent", "good", "inaccuracy", "mistake", "blunder")
+    CLASS_THRESHOLDS = (
+        11,   # ! - great move (up to 10 is best, !!)
+        26,   # normal move
+        50,   # ?! - losing 0.5-1 pawn
+        100,  # ? - losing 1-3 pawns
+        300,  # ?? - losing 3+ pawns
+    )
+    ACCURACY_WEIGHTS = dict(zip(MOVE_CLASSES, (1.0, 0.95, 0.9, 0.6, 0.3, 0)))
+    # Annotation symbol for each class that gets one in reports
+    MOVE_SYMBOLS = {"inaccuracy": "?!", "mistake": "?", "blunder": "??"}
+
+    # Search depth per game type: fast games gain little from deeper search
+    DEPTH_BY_TIME_CLASS = {"bullet": 14, "blitz": 16, "rapid": 18, "daily": 20}
+    DEFAULT_DEPTH = 18
+
     def __init__(self):
         """Initialize the analyzer."""
         self.cache_dir = Path("data")
         self.cache_file = self.cache_dir / "games_cache.json"
-        self.analysis_cache = self.cache_dir / "detailed_analysis_cache.json"
+        self.analysis_cache = self.cache_dir / "detailed_analysis_cache.json"  # Legacy JSON cache
+        self.analysis_db = self.cache_dir / "analysis.db"
+        self.book_file = self.cache_dir / "book.bin"  # Optional Polyglot opening book
 
-        # Load games cache
+        # Load games cache; find_game reloads it when the file changes
+        self._games_mtime = self._cache_mtime()
         self.games = self._load_games()
-        self.cached_analysis = self._load_analysis_cache()
+        self._build_indexes()
+        self.analysis_store = AnalysisStore(self.analysis_db)
+        if not len(self.analysis_store):
+            self._import_legacy_cache()
+
+        # Stockfish processes are started on first use and kept for later
+        # games, so their hash tables carry over. close() (or leaving a with
+        # block) shuts them down; python-chess drives each engine from a
+        # non-daemon thread, so an engine left running keeps the interpreter
+        # from exiting
+        self._engine = None
+        self._pool = None
+        self._closer_registered = False
+
+        # Canvas JSON formatter, created on the first json request
+        self._canvas = None
+
+        # Book moves are classified without an engine search
+        try:
+            self._book = chess.polyglot.open_reader(self.book_file)
+        except FileNotFoundError:
+            self._book = None
 
     def _load_games(self) -> List[Dict]:
         """Load games from cache."""
-        if self.cache_file.exists():
-            with open(self.cache_file, 'r') as f:
-                data = json.load(f)
-                return data.get("games", [])
-        return []
-
-    def _load_analysis_cache(self) -> Dict:
-        """Load cached analysis."""
-        if self.analysis_cache.exists():
-            with open(self.analysis_cache, 'r') as f:
-                return json.load(f)
-        return {}
-
-    def _save_analysis_cache(self):
-        """Save analysis cache."""
-        with open(self.analysis_cache, 'w') as f:
-            json.dump(self.cached_analysis, f, indent=2)
+        try:
+            return load_json(self.cache_file).get("games", [])
+        except FileNotFoundError:
+            return []
+
+    def _cache_mtime(self) -> Optional[int]:
+        """Modification time of the games cache, or None if it is missing."""
+        try:
+            return self.cache_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _refresh_games(self):
+        """Reload the games cache and its indexes if the file changed on disk."""
+        mtime = self._cache_mtime()
+        if mtime != self._games_mtime:
+            self._games_mtime = mtime
+            self.games = self._load_games()
+            self._build_indexes()
+
+    def _build_indexes(self):
+        """Precompute per-game search fields and index them for exact-match lookups."""
+        # Parallel lists of the lowercased fields find_game compares against;
+        # dates use isoformat(), which is much cheaper than strftime()
+        self._dates = [date.fromtimestamp(game.get("end_time", 0)).isoformat() for game in self.games]
+        self._white_lc = [game.get("white", {}).get("username", "").lower() for game in self.games]
+        self._black_lc = [game.get("black", {}).get("username", "").lower() for game in self.games]
+        self._url_lc = [game.get("url", "").lower() for game in self.games]
+
+        self._date_index = {}
+        self._player_index = {}
+        self._url_index = {}
+
+        # setdefault keeps the first game for each key, like a front-to-back scan
+        for i, (date_str, white, black, url) in enumerate(
+                zip(self._dates, self._white_lc, self._black_lc, self._url_lc)):
+            self._date_index.setdefault(date_str, i)
+            self._player_index.setdefault(white, i)
+            self._player_index.setdefault(black, i)
+            self._url_index.setdefault(url, i)
+
+        # Sorted player names for prefix searches
+        self._names = sorted(self._player_index)
+
+    def _import_legacy_cache(self):
+        """
+        Copy analyses from detailed_analysis_cache.json into the database.
+
+        Both the original URL-keyed layout ({url: analysis}, each analysis
+        carrying its engine_depth) and the {pgn_key: {depth: analysis}} one
+        are read. URL-keyed entries are matched to their game's PGN and
+        dropped if that game is no longer cached; cached failures such as
+        {"error": "Invalid PGN"} are skipped.
+        """
+        try:
+            legacy = load_json(self.analysis_cache)
+        except FileNotFoundError:
+            return
+
+        entries = []
+        for key, entry in legacy.items():
+            if not isinstance(entry, dict) or not entry:
+                continue
+            if all(depth.isdigit() for depth in entry):
+                entries.extend(
+                    (key, int(depth), analysis) for depth, analysis in entry.items()
+                    if isinstance(analysis, dict) and "error" not in analysis
+                )
+                continue
+            if "error" in entry or "engine_depth" not in entry:
+                continue
+            index = self._url_index.get(key.lower())
+            pgn = self.games[index].get("pgn") if index is not None else None
+            if pgn:
+                entries.append((pgn_key(pgn), entry["engine_depth"], entry))
+        self.analysis_store.put_many(entries)
 
     def find_game(self, query: str) -> Optional[Dict]:
         """
@@ -61,26 +232,42 @@ class OnDemandAnalyzer:
         Returns:
             Game data if found
         """
+        self._refresh_games()
         query_lower = query.lower()
 
-        # Try to find by date first
-        for game in self.games:
-            game_date = datetime.fromtimestamp(game.get("end_time", 0))
-            date_str = game_date.strftime("%Y-%m-%d")
-
+        # Exact date, player or URL matches are dict lookups; the earliest wins
+        hits = [
+            index[query_lower]
+            for index in (self._date_index, self._player_index, self._url_index)
+            if query_lower in index
+        ]
+        if hits:
+            return self.games[min(hits)]
+
+        # A partly typed player name: binary search the sorted names for
+        # those starting with the query; the earliest game wins
+        names = self._names
+        hits = []
+        for k in range(bisect_left(names, query_lower), len(names)):
+            if not names[k].startswith(query_lower):
+                break
+            hits.append(self._player_index[names[k]])
+        if hits:
+            return self.games[min(hits)]
+
+        # Fall back to substring matching, by date first
+        for i, (date_str, white, black, url) in enumerate(
+                zip(self._dates, self._white_lc, self._black_lc, self._url_lc)):
             if query_lower in date_str:
-                return game
+                return self.games[i]
 
             # Check opponent names
-            white_player = game.get("white", {}).get("username", "").lower()
-            black_player = game.get("black", {}).get("username", "").lower()
-
-            if query_lower in white_player or query_lower in black_player:
-                return game
+            if query_lower in white or query_lower in black:
+                return self.games[i]
 
             # Check game URL
-            if query_lower in game.get("url", "").lower():
-                return game
+            if query_lower in url:
+                return self.games[i]
 
         return None
 
@@ -95,123 +282,297 @@ class OnDemandAnalyzer:
         Returns:
             Detailed analysis like Lichess
         """
+        moves = []
         try:
-            # Parse PGN
-            game = chess.pgn.read_game(StringIO(pgn))
-            if not game:
+            # Parse PGN; only the mainline is needed, so the moves are played
+            # onto a board rather than into a full node tree
+            final_board = chess.pgn.read_game(StringIO(pgn), Visitor=_MainlineBuilder)
+            if final_board is None:
                 return {"error": "Invalid PGN"}
 
-            board = game.board()
+            moves = final_board.move_stack
             analysis = []
             move_classifications = []
 
-            # Try to use local Stockfish - check multiple locations
-            engine_paths = [
-                "/opt/homebrew/bin/stockfish",  # Homebrew on Apple Silicon
-                "/usr/local/bin/stockfish",      # Homebrew on Intel Mac
-                "/usr/bin/stockfish",            # Linux
-                "stockfish"                      # In PATH
-            ]
-
-            engine = None
-            for path in engine_paths:
-                try:
-                    engine = chess.engine.SimpleEngine.popen_uci(path)
-                    print(f"Using engine: {path}")
-                    break
-                except:
-                    continue
-
-            if not engine:
+            # One evaluation per position: the evaluation after move N is the
+            # evaluation before move N+1. Scores are from White's point of view.
+            # Book moves and forced replies need no search of their own.
+            free_moves = self._free_moves(final_board.root(), moves)
+            evaluations = self._evaluate_positions(final_board.root(), moves, depth, free_moves)
+            if evaluations is None:
                 print("Stockfish not found, using simplified analysis")
-                return self._simplified_analysis(game)
-
-            prev_eval = 0  # Starting position
-            move_num = 0
-
-            for move in game.mainline_moves():
-                move_num += 1
-
-                # Analyze position before move
-                info_before = engine.analyse(board, chess.engine.Limit(depth=depth))
-                eval_before = self._score_to_cp(info_before["score"])
-
-                # Make the move
-                board.push(move)
-
-                # Analyze position after move
-                info_after = engine.analyse(board, chess.engine.Limit(depth=depth))
-                eval_after = self._score_to_cp(info_after["score"])
-
-                # Calculate accuracy loss
-                if move_num % 2 == 1:  # White's move
-                    eval_loss = eval_before - eval_after
-                else:  # Black's move
-                    eval_loss = eval_after - eval_before
+                return self._simplified_analysis(moves)
+
+            # Scores are converted as the moves are walked; positions the
+            # engine skipped take the last known evaluation
+            score_to_cp = self._score_to_cp
+            eval_after = 0 if evaluations[0] is None else score_to_cp(evaluations[0][0])
+
+            move_number = 0  # Full-move number, advanced on White's moves
+            classify = self._classify_move
+
+            for move_num, move in enumerate(moves, 1):
+                white_move = move_num % 2 == 1
+                if white_move:
+                    move_number += 1
+                eval_before = eval_after
+                evaluation = evaluations[move_num]
+                if evaluation is not None:
+                    eval_after = score_to_cp(evaluation[0])
+
+                if free_moves[move_num - 1]:
+                    # Book move or the only legal move
+                    eval_loss = 0
+                    classification = "best"
+                    best_move = move
+                else:
+                    best_move = evaluations[move_num - 1][1]
 
-                # Classify move (Lichess style)
-                classification = self._classify_move(eval_loss)
+                    # Calculate accuracy loss
+                    if white_move:  # White's move
+                        eval_loss = eval_before - eval_after
+                    else:  # Black's move
+                        eval_loss = eval_after - eval_before
 
-                # Get best move
-                best_move = info_before.get("pv", [None])[0] if "pv" in info_before else None
+                    # Classify move (Lichess style)
+                    classification = classify(eval_loss)
 
+                uci = move.uci()
                 move_data = {
-                    "move": str(move),
-                    "move_number": (move_num + 1) // 2,
+                    "move": uci,
+                    "move_number": move_number,
                     "eval_before": eval_before,
                     "eval_after": eval_after,
                     "eval_loss": eval_loss,
                     "classification": classification,
-                    "best_move": str(best_move) if best_move else str(move),
+                    "best_move": best_move.uci() if best_move else uci,
                     "depth": depth
                 }
 
                 analysis.append(move_data)
                 move_classifications.append(classification)
 
-                prev_eval = eval_after
-
-            engine.quit()
-
             # Calculate statistics
             total_moves = len(move_classifications)
             accuracy = self._calculate_accuracy(move_classifications)
+            counts = Counter(move_classifications)
 
             return {
                 "analysis": analysis,
                 "accuracy": accuracy,
                 "total_moves": total_moves,
-                "blunders": sum(1 for c in move_classifications if c == "blunder"),
-                "mistakes": sum(1 for c in move_classifications if c == "mistake"),
-                "inaccuracies": sum(1 for c in move_classifications if c == "inaccuracy"),
-                "good_moves": sum(1 for c in move_classifications if c in ["good", "excellent", "best"]),
+                "blunders": counts["blunder"],
+                "mistakes": counts["mistake"],
+                "inaccuracies": counts["inaccuracy"],
+                "good_moves": counts["good"] + counts["excellent"] + counts["best"],
                 "engine_depth": depth
             }
 
         except Exception as e:
             print(f"Engine analysis error: {e}")
-            return self._simplified_analysis(game)
+            return self._simplified_analysis(moves)
+
+    def _find_engine(self) -> Optional[str]:
+        """Return the first Stockfish executable found in ENGINE_PATHS."""
+        for path in self.ENGINE_PATHS:
+            resolved = shutil.which(path)
+            if resolved:
+                return resolved
+        return None
+
+    def _open_engine(self, engine_path: str) -> chess.engine.SimpleEngine:
+        """
+        Return the analyzer's Stockfish, starting and configuring it on first use.
+
+        Options go out once, when the process starts; the running engine then
+        keeps its hash across positions and games.
+        """
+        if self._engine is None:
+            self._engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+            self._engine.configure(self.ENGINE_OPTIONS)
+            self._register_closer()
+        return self._engine
+
+    def _open_pool(self, engine_path: str, workers: int) -> ProcessPoolExecutor:
+        """Return the pool of Stockfish worker processes, starting it on first use."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                             initargs=(engine_path, self.WORKER_ENGINE_OPTIONS))
+            self._register_closer()
+        return self._pool
+
+    def _register_closer(self):
+        """
+        Best-effort shutdown of engines still running at interpreter exit.
+
+        atexit handlers only run after the interpreter has joined
+        python-chess's engine threads, so this cannot stand in for close():
+        callers use the analyzer as a context manager, as main() does.
+        """
+        if not self._closer_registered:
+            owner_pid = os.getpid()
+
+            def close_at_exit():
+                # Forked pool workers inherit the hook but don't own the engines
+                if os.getpid() == owner_pid:
+                    self.close()
+
+            atexit.register(close_at_exit)
+            self._closer_registered = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Quit the engines and worker pool and close the opening book and the
+        analysis database. Safe to call twice.
+        """
+        self._discard_engines()
+        book, self._book = self._book, None
+        if book is not None:
+            book.close()
+        self.analysis_store.close()
+
+    def _discard_engines(self):
+        """Quit the Stockfish engine and worker pool; the next analysis starts new ones."""
+        engine, self._engine = self._engine, None
+        pool, self._pool = self._pool, None
+        if engine is not None:
+            try:
+                engine.quit()
+            except chess.engine.EngineTerminatedError:
+                pass
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _free_moves(self, board: chess.Board, moves: List[chess.Move]) -> List[bool]:
+        """
+        Flag the moves that can be classified without an engine search.
+
+        These are moves from the opening book, up to the first move that
+        leaves it, and moves that were the only legal move.
+
+        Args:
+            board: Starting position of the game
+            moves: Mainline moves
+
+        Returns:
+            One flag per move
+        """
+        board = board.copy(stack=False)
+        in_book = self._book is not None
+        free = []
+        for move in moves:
+            if in_book:
+                in_book = any(entry.move == move for entry in self._book.find_all(board))
+            free.append(in_book or board.legal_moves.count() == 1)
+            board.push(move)
+        return free
+
+    def _evaluate_positions(self, board: chess.Board, moves: List[chess.Move], depth: int,
+                            free_moves: Optional[List[bool]] = None) -> Optional[List[Optional[Tuple]]]:
+        """
+        Evaluate the start position and the position after every move.
+
+        With several CPU cores the positions are spread over a pool of up to
+        MAX_WORKERS single-threaded Stockfish workers; on a one-CPU machine
+        one engine searches them in order. Both stay alive for the
+        analyzer's next game.
+
+        Args:
+            board: Starting position of the game
+            moves: Mainline moves
+            depth: Analysis depth
+            free_moves: Per-move flags from _free_moves; positions only
+                reached or left by such moves are not searched
+
+        Returns:
+            (White-POV score, best move) per position, None for positions
+            not searched, or None without Stockfish
+        """
+        engine_path = self._find_engine()
+        if not engine_path:
+            return None
+
+        if free_moves is None:
+            free_moves = [False] * len(moves)
+        last = len(moves)
+        needed = [(ply > 0 and not free_moves[ply - 1]) or (ply < last and not free_moves[ply])
+                  for ply in range(last + 1)]
+
+        workers = min(os.cpu_count() or 1, self.MAX_WORKERS)
+        print(f"Using engine: {engine_path} ({workers} worker{'s' if workers > 1 else ''})")
 
-    def _score_to_cp(self, score) -> int:
-        """Convert engine score to centipawns."""
         try:
-            if score.is_mate():
-                # Mate score
-                if score.mate() > 0:
-                    return 10000 - score.mate() * 100  # Winning
-                else:
-                    return -10000 - score.mate() * 100  # Losing
+            evaluations = [None] * (last + 1)
+
+            if workers > 1:
+                plies = [ply for ply in range(last + 1) if needed[ply]]
+                positions = self._position_sequence(board, moves)
+                tasks = [(*positions[ply], depth) for ply in plies]
+                results = self._open_pool(engine_path, workers).map(_analyse_position, tasks)
+                for ply, evaluation in zip(plies, results):
+                    evaluations[ply] = evaluation
+                return evaluations
+
+            engine = self._open_engine(engine_path)
+            limit = chess.engine.Limit(depth=depth)
+            for ply in range(last + 1):
+                if ply:
+                    board.push(moves[ply - 1])
+                if needed[ply]:
+                    evaluations[ply] = _evaluation(engine.analyse(board, limit))
+            return evaluations
+        except Exception:
+            # Don't reuse an engine or pool left in an unknown state
+            self._discard_engines()
+            raise
+
+    def _position_sequence(self, board: chess.Board,
+                           moves: List[chess.Move]) -> List[Tuple[str, List[str]]]:
+        """
+        Describe every position of the game in a single pass over the moves.
+
+        Each position is given as the FEN after the last capture or pawn move
+        plus the moves played since. Earlier positions can never repeat, so
+        the engine still sees every repetition without replaying the game
+        from the start for each position.
+
+        Args:
+            board: Starting position of the game
+            moves: Mainline moves
+
+        Returns:
+            (FEN, UCI moves) for the start position and after every move
+        """
+        board = board.copy(stack=False)
+        fen, ucis = board.fen(), []
+        positions = [(fen, ucis)]
+        for move in moves:
+            zeroing = board.is_zeroing(move)
+            board.push(move)
+            if zeroing:
+                fen, ucis = board.fen(), []
             else:
-                # Regular centipawn score
-                # Handle both old and new python-chess API
-                if hasattr(score, 'score'):
-                    return score.score()
-                elif hasattr(score, 'relative'):
-                    return score.relative.score()
-                else:
-                    return 0
-        except:
-            return 0
+                ucis = ucis + [move.uci()]
+            positions.append((fen, ucis))
+        return positions
+
+    def _score_to_cp(self, score) -> int:
+        """Convert a White-POV engine score to centipawns (mate in N = 10000 - N * 100)."""
+        cp = score.score()
+        if cp is not None:
+            return cp
+
+        # Mate score; MateGiven (mate() == 0) means the side to move is already mated
+        mate = score.mate()
+        if mate > 0 or score == chess.engine.MateGiven:
+            return 10000 - mate * 100  # Winning
+        return -10000 - mate * 100  # Losing
 
     def _classify_move(self, eval_loss: int) -> str:
         """
@@ -219,45 +580,21 @@ class OnDemandAnalyzer:
 
         Returns: blunder, mistake, inaccuracy, good, excellent, best
         """
-        eval_loss = abs(eval_loss)
-
-        if eval_loss >= 300:
-            return "blunder"     # ?? - losing 3+ pawns
-        elif eval_loss >= 100:
-            return "mistake"     # ? - losing 1-3 pawns
-        elif eval_loss >= 50:
-            return "inaccuracy"  # ?! - losing 0.5-1 pawn
-        elif eval_loss <= 10:
-            return "best"        # !! - perfect move
-        elif eval_loss <= 25:
-            return "excellent"   # ! - great move
-        else:
-            return "good"        # normal move
+        return self.MOVE_CLASSES[bisect_right(self.CLASS_THRESHOLDS, abs(eval_loss))]
 
     def _calculate_accuracy(self, classifications: List[str]) -> float:
         """Calculate game accuracy percentage (Lichess formula approximation)."""
         if not classifications:
             return 0
 
-        # Weighted scoring
-        weights = {
-            "best": 1.0,
-            "excellent": 0.95,
-            "good": 0.9,
-            "inaccuracy": 0.6,
-            "mistake": 0.3,
-            "blunder": 0
-        }
-
-        total_score = sum(weights.get(c, 0.5) for c in classifications)
+        # Weighted scoring; map() runs weights.get(c, 0.5) without a Python-level loop
+        total_score = sum(map(self.ACCURACY_WEIGHTS.get, classifications, repeat(0.5)))
         accuracy = (total_score / len(classifications)) * 100
 
         return round(accuracy, 1)
 
-    def _simplified_analysis(self, game) -> Dict:
+    def _simplified_analysis(self, moves: List[chess.Move]) -> Dict:
         """Fallback analysis without engine."""
-        moves = list(game.mainline_moves())
-
         return {
             "analysis": [],
             "accuracy": 75.0,  # Default estimate
@@ -277,10 +614,8 @@ class OnDemandAnalyzer:
         Returns:
             Markdown with embedded HTML optimized for TypingMind rendering
         """
-        import sys
-        from pathlib import Path
-        # Add scripts directory to path for import
-        sys.path.insert(0, str(Path(__file__).parent))
+        # Imported on first use; the scripts directory is already importable
+        # (see the analysis_store import), so sys.path needs no new entry
         from typingmind_viewer import create_typingmind_output
 
         # Generate TypingMind-optimized output
@@ -297,7 +632,7 @@ class OnDemandAnalyzer:
         white = game.get("white", {}).get("username", "?")
         black = game.get("black", {}).get("username", "?")
         result = game.get("white", {}).get("result", "?")
-        date = datetime.fromtimestamp(game.get("end_time", 0)).strftime("%Y-%m-%d %H:%M")
+        date = datetime.fromtimestamp(game.get("end_time", 0)).isoformat(" ", "minutes")
 
         report = [
             f"# 🔍 Computer Analysis",
@@ -327,11 +662,11 @@ class OnDemandAnalyzer:
         ])
 
         # Show worst moves
-        worst_moves = sorted(
-            [m for m in analysis.get("analysis", []) if m["classification"] in ["blunder", "mistake"]],
-            key=lambda x: abs(x["eval_loss"]),
-            reverse=True
-        )[:5]
+        worst_moves = heapq.nlargest(
+            5,
+            (m for m in analysis.get("analysis", []) if m["classification"] in CRITICAL_CLASSES),
+            key=lambda x: abs(x["eval_loss"])
+        )
 
         if worst_moves:
             report.append("### Biggest Mistakes:")
@@ -342,7 +677,7 @@ class OnDemandAnalyzer:
                 best = move_data["best_move"]
                 loss = abs(move_data["eval_loss"]) / 100
 
-                symbol = "??" if move_data["classification"] == "blunder" else "?"
+                symbol = self.MOVE_SYMBOLS[move_data["classification"]]
 
                 report.append(f"**Move {move_num}. {move} {symbol}**")
                 report.append(f"- Lost {loss:.1f} pawns of advantage")
@@ -370,7 +705,7 @@ class OnDemandAnalyzer:
                 bar = "="
 
             classification = move_data["classification"]
-            if classification in ["blunder", "mistake"]:
+            if classification in CRITICAL_CLASSES:
                 marker = f" ← {classification}"
             else:
                 marker = ""
@@ -407,13 +742,15 @@ class OnDemandAnalyzer:
 
         return "\n".join(report)
 
-    def analyze_game_by_request(self, query: str, output_format: str = "markdown") -> str:
+    def analyze_game_by_request(self, query: str, output_format: str = "markdown",
+                                depth: Optional[int] = None) -> str:
         """
         Main entry point for TypingMind requests.
 
         Args:
             query: User query to find and analyze game
             output_format: "markdown", "html", or "json" for TypingMind Interactive Canvas
+            depth: Analysis depth (None = chosen from the game's time class)
 
         Returns:
             Formatted analysis in requested format
@@ -424,40 +761,58 @@ class OnDemandAnalyzer:
         if not game:
             return f"❌ Game not found for query: '{query}'\n\nTry searching by:\n- Date (e.g., '2025-11-29')\n- Opponent name\n- Game URL"
 
-        # Check if already analyzed
-        game_id = game.get("url", "")
-        if game_id in self.cached_analysis:
+        if depth is None:
+            depth = self.DEPTH_BY_TIME_CLASS.get(game.get("time_class"), self.DEFAULT_DEPTH)
+
+        pgn = game.get("pgn", "")
+        if not pgn:
+            return "❌ No PGN data available for this game"
+
+        # Check if already analyzed at least this deep; entries are keyed by
+        # the PGN itself, so shallower and deeper analyses live side by side
+        key = pgn_key(pgn)
+        analysis = self.analysis_store.get(key, depth)
+        if analysis:
             print("Using cached analysis")
-            analysis = self.cached_analysis[game_id]
         else:
             # Perform new analysis
-            print(f"Analyzing game from {datetime.fromtimestamp(game.get('end_time', 0)).strftime('%Y-%m-%d %H:%M')}")
-            pgn = game.get("pgn", "")
-
-            if not pgn:
-                return "❌ No PGN data available for this game"
-
-            analysis = self.analyze_with_stockfish(pgn)
+            print(f"Analyzing game from {datetime.fromtimestamp(game.get('end_time', 0)).isoformat(' ', 'minutes')}")
+            analysis = self.analyze_with_stockfish(pgn, depth)
 
             # Cache the result
-            self.cached_analysis[game_id] = analysis
-            self._save_analysis_cache()
+            self.analysis_store.put(key, analysis.get("engine_depth", 0), analysis)
 
         # Generate output in requested format
         if output_format == "json":
             # Return JSON for TypingMind Interactive Canvas
-            import sys
-            from pathlib import Path
-            sys.path.insert(0, str(Path(__file__).parent))
-            from json_output_for_canvas import ChessDataForCanvas
-
-            processor = ChessDataForCanvas()
-            return json.dumps(processor.prepare_canvas_data(game, analysis), indent=2)
+            if self._canvas is None:
+                from json_output_for_canvas import ChessDataForCanvas
+                self._canvas = ChessDataForCanvas()
+            return dumps_json(self._canvas.prepare_canvas_data(game, analysis), indent=True).decode()
         elif output_format == "html":
             return self.generate_interactive_html_viewer(game, analysis)
         else:  # markdown
             return self.generate_lichess_style_report(game, analysis)
 
+    def analyze_many(self, queries: List[str], output_format: str = "markdown") -> List[str]:
+        """
+        Analyze several games in one go, reusing the same Stockfish processes.
+
+        The engines are shut down when the batch ends, so a caller that never
+        calls close() still does not leave engine threads running.
+
+        Args:
+            queries: User queries, one per game
+            output_format: "markdown", "html", or "json" for TypingMind Interactive Canvas
+
+        Returns:
+            Formatted analysis for each query, in order
+        """
+        try:
+            return [self.analyze_game_by_request(query, output_format) for query in queries]
+        finally:
+            self._discard_engines()
+
 
 def main():
     """CLI entry point for testing."""
@@ -467,8 +822,8 @@ def main():
         sys.exit(1)
 
     query = " ".join(sys.argv[1:])
-    analyzer = OnDemandAnalyzer()
-    result = analyzer.analyze_game_by_request(query)
+    with OnDemandAnalyzer() as analyzer:
+        result = analyzer.analyze_game_by_request(query)
     print(result)
 
 
@@ -7,18 +7,56 @@ and saves them to a JSON cache file for analysis.
 """
 
 import os
-import json
+import threading
 import time
 import requests
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+from json_io import dump_json, load_json
+
+
+class RateLimiter:
+    """Thread-safe limiter allowing at most `calls` requests per `period` seconds."""
+
+    def __init__(self, calls: int = 2, period: float = 1.0):
+        self.calls = calls
+        self.period = period
+        self._lock = threading.Lock()
+        self._timestamps = deque()
+
+    def wait(self):
+        """Block until another request may be sent, then record it."""
+        with self._lock:
+            now = time.monotonic()
+            if len(self._timestamps) >= self.calls:
+                delay = self._timestamps[0] + self.period - now
+                if delay > 0:
+                    time.sleep(delay)
+                    now = time.monotonic()
+                self._timestamps.popleft()
+            self._timestamps.append(now)
 
 
 class ChessComFetcher:
     """Fetches games from Chess.com public API."""
 
     BASE_URL = "https://api.chess.com/pub"
+    MAX_WORKERS = 4  # Concurrent archive downloads
+
+    # Summary bucket for each of the player's result codes; anything else is a draw
+    RESULT_MAP = {
+        "win": "wins",
+        "resigned": "losses",
+        "timeout": "losses",
+        "checkmated": "losses",
+        "abandoned": "losses",
+    }
 
     def __init__(self, username: str, cache_dir: str = "data"):
         """
@@ -34,11 +72,23 @@ class ChessComFetcher:
         self.cache_file = self.cache_dir / "games_cache.json"
         self.cache = self._load_cache()
 
+        # Shared keep-alive session; the rate limiter keeps us within
+        # Chess.com's guidance even with several archives in flight
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "ChessKnowledgeBase/1.0"
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.rate_limiter = RateLimiter(calls=2, period=1.0)
+        # Membership sets for dedup; the cache keeps its lists for saving
+        self._known_urls = {g.get("url") for g in self.cache["games"]}
+        self._fetched_archives = set(self.cache["archives_fetched"])
+        # End times as a compact C array for the summary's date range
+        self._end_times = array("q", (g.get("end_time", 0) for g in self.cache["games"]))
+
     def _load_cache(self) -> Dict:
         """Load existing cache or create empty one."""
         if self.cache_file.exists():
-            with open(self.cache_file, 'r') as f:
-                return json.load(f)
+            return load_json(self.cache_file)
         return {
             "username": self.username,
             "last_update": None,
@@ -49,8 +99,7 @@ class ChessComFetcher:
     def _save_cache(self):
         """Save cache to disk."""
         self.cache["last_update"] = datetime.now().isoformat()
-        with open(self.cache_file, 'w') as f:
-            json.dump(self.cache, f, indent=2)
+        dump_json(self.cache, self.cache_file)
 
     def _api_request(self, endpoint: str) -> Optional[Dict]:
         """
@@ -66,14 +115,10 @@ class ChessComFetcher:
         print(f"Fetching: {url}")
 
         try:
-            response = requests.get(url, headers={
-                "User-Agent": "ChessKnowledgeBase/1.0"
-            })
-            response.raise_for_status()
-
             # Rate limiting - Chess.com asks for reasonable delays
-            time.sleep(0.5)
-
+            self.rate_limiter.wait()
+            response = self.session.get(url)
+            response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"Error fetching {url}: {e}")
@@ -140,36 +185,51 @@ class ChessComFetcher:
         new_games = 0
         current_month = datetime.now().strftime("%Y/%m")
 
+        archives_processed = 0
+
+        # Always re-fetch current month to get new games
+        # Skip other months if already fetched
+        to_fetch = []
         for archive_url in archives:
-            # Always re-fetch current month to get new games
-            # Skip other months if already fetched
-            if archive_url in self.cache["archives_fetched"] and current_month not in archive_url:
+            if archive_url in self._fetched_archives and current_month not in archive_url:
                 print(f"Skipping already fetched: {archive_url}")
                 continue
+            to_fetch.append(archive_url)
 
-            # Fetch archive
-            archive_data = self._api_request(archive_url.replace("https://api.chess.com/pub", ""))
-            if not archive_data or "games" not in archive_data:
-                continue
-
-            # Process games
-            for game in archive_data["games"]:
-                # Add metadata
-                game["fetched_at"] = datetime.now().isoformat()
-                game["archive_url"] = archive_url
-
-                # Check if game already exists (by URL)
-                if not any(g.get("url") == game.get("url") for g in self.cache["games"]):
-                    self.cache["games"].append(game)
-                    new_games += 1
-
-            # Mark archive as fetched (but don't mark current month to allow re-fetching)
-            if current_month not in archive_url and archive_url not in self.cache["archives_fetched"]:
-                self.cache["archives_fetched"].append(archive_url)
-            print(f"Fetched {len(archive_data['games'])} games from {archive_url}")
-
-            # Save cache after each archive (in case of interruption)
-            self._save_cache()
+        endpoints = [url.replace(self.BASE_URL, "") for url in to_fetch]
+        executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS)
+        try:
+            # Download concurrently, but merge in archive order so dedup stays deterministic
+            for archive_url, archive_data in zip(to_fetch, executor.map(self._api_request, endpoints)):
+                if not archive_data or "games" not in archive_data:
+                    continue
+
+                # Process games
+                for game in archive_data["games"]:
+                    # Add metadata
+                    game["fetched_at"] = datetime.now().isoformat()
+                    game["archive_url"] = archive_url
+
+                    # Check if game already exists (by URL)
+                    url = game.get("url")
+                    if url not in self._known_urls:
+                        self._known_urls.add(url)
+                        self.cache["games"].append(game)
+                        self._end_times.append(game.get("end_time", 0))
+                        new_games += 1
+
+                # Mark archive as fetched (but don't mark current month to allow re-fetching)
+                if current_month not in archive_url and archive_url not in self._fetched_archives:
+                    self._fetched_archives.add(archive_url)
+                    self.cache["archives_fetched"].append(archive_url)
+                print(f"Fetched {len(archive_data['games'])} games from {archive_url}")
+                archives_processed += 1
+        finally:
+            # Drop downloads not yet started if we were interrupted
+            executor.shutdown(wait=True, cancel_futures=True)
+            # Rewrite the cache once, also when interrupted, rather than after every archive
+            if archives_processed:
+                self._save_cache()
 
         return new_games
 
@@ -185,50 +245,45 @@ class ChessComFetcher:
         if total_games == 0:
             return {"total_games": 0}
 
-        # Count by time control
-        time_controls = {}
-        results = {"wins": 0, "losses": 0, "draws": 0}
-        colors = {"white": 0, "black": 0}
+        # Single pass over the games
+        time_controls = Counter()
+        results = Counter(wins=0, losses=0, draws=0)
+        colors = Counter(white=0, black=0)
+        username = self.username
+        result_map = self.RESULT_MAP
 
         for game in self.cache["games"]:
             # Time control
-            tc = game.get("time_class", "unknown")
-            time_controls[tc] = time_controls.get(tc, 0) + 1
+            time_controls[game.get("time_class", "unknown")] += 1
 
             # Results
-            white_player = game.get("white", {}).get("username", "").lower()
-            black_player = game.get("black", {}).get("username", "").lower()
-
-            if white_player == self.username:
+            white = game.get("white", {})
+            if white.get("username", "").lower() == username:
                 colors["white"] += 1
-                result = game.get("white", {}).get("result", "")
-            elif black_player == self.username:
-                colors["black"] += 1
-                result = game.get("black", {}).get("result", "")
+                result = white.get("result", "")
             else:
-                continue
+                black = game.get("black", {})
+                if black.get("username", "").lower() != username:
+                    continue
+                colors["black"] += 1
+                result = black.get("result", "")
 
-            if "win" in result:
-                results["wins"] += 1
-            elif result in ["resigned", "timeout", "checkmated", "abandoned"]:
-                results["losses"] += 1
-            else:
-                results["draws"] += 1
+            results[result_map.get(result, "draws")] += 1
 
         # Get date range
-        dates = [game.get("end_time", 0) for game in self.cache["games"]]
-        if dates:
-            oldest = datetime.fromtimestamp(min(dates)).strftime("%Y-%m-%d")
-            newest = datetime.fromtimestamp(max(dates)).strftime("%Y-%m-%d")
+        end_times = self._end_times
+        if end_times:
+            oldest = datetime.fromtimestamp(min(end_times)).strftime("%Y-%m-%d")
+            newest = datetime.fromtimestamp(max(end_times)).strftime("%Y-%m-%d")
         else:
             oldest = newest = "N/A"
 
         return {
             "total_games": total_games,
             "date_range": f"{oldest} to {newest}",
-            "time_controls": time_controls,
-            "results": results,
-            "colors": colors,
+            "time_controls": dict(time_controls),
+            "results": dict(results),
+            "colors": dict(colors),
             "win_rate": round(results["wins"] / total_games * 100, 1) if total_games > 0 else 0
         }
 
@@ -6,15 +6,67 @@ This script converts the JSON analysis into readable Markdown files
 that can be consumed by TypingMind or other knowledge base systems.
 """
 
-import json
-from datetime import datetime
+import heapq
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter, methodcaller
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
+
+from json_io import load_json
+
+try:
+    import ijson  # Optional: lets large caches be streamed game by game
+except ImportError:
+    ijson = None
+
+# Sort key for games; a C-level call, unlike a lambda, and tolerant of a missing end_time
+_END_TIME = methodcaller("get", "end_time", 0)
+
+# Value of the PGN Opening tag, up to the closing bracket
+_OPENING_RE = re.compile(r'\[Opening ([^\]]*)\]')
+
+
+def _opening_total(item) -> int:
+    """Sort key for (opening, stats) pairs: number of games played."""
+    return item[1].get("total", 0)
+
+
+def _opening_rows(openings: Dict) -> Iterator[Tuple[str, int, float]]:
+    """Yield (opening, total, win_rate) for each opening's stats."""
+    for opening, stats in openings.items():
+        yield opening, stats["total"], stats.get("win_rate", 0)
+
+
+# One row of the recent games table
+_ROW_TMPL = ("| {date} | {opponent} | {opp_rating} | {color} | {result} | "
+             "{opening} | {tc} | [View]({url}) |\n")
+
+# Rows of the summary ratings table and the opening tables
+_RATING_ROW = "| %s | **%s** |\n"
+_OPENING_TABLE_HEAD = ("| Opening | Games | Win Rate | Performance |\n"
+                       "|---------|-------|----------|-------------|\n")
+_OPENING_ROW = "| %s | %s | %s%% | %s %sW/%sL/%sD |\n"
+
+# Result column, keyed by the outcome from _get_result
+_RESULT_EMOJI = {"win": "✅ Won", "loss": "❌ Lost"}
+
+@lru_cache(maxsize=64)
+def _fmt_label(key: str) -> str:
+    """Turn a snake_case key such as a time class into a display label."""
+    return key.replace("_", " ").title()
 
 
 class MarkdownGenerator:
     """Generates Markdown documentation from chess analysis."""
 
+    RECENT_GAMES = 20  # Games listed in recent_games.md and used for recent form
+
     def __init__(self, analysis_file: str = "data/analysis_results.json",
                  games_file: str = "data/games_cache.json",
                  output_dir: str = "knowledge"):
@@ -32,20 +84,61 @@ class MarkdownGenerator:
         self.output_dir.mkdir(exist_ok=True)
 
         self.analysis = {}
-        self.games_data = {}
+        self.username = ""
+        self._username_lc = ""
+        self.recent_games = []
+        self._print_lock = threading.Lock()  # generate_all runs the pages in threads
         self.load_data()
 
     def load_data(self):
-        """Load analysis and games data."""
+        """
+        Load analysis and games data.
+
+        Only the most recent games are kept from the games cache; with ijson
+        installed the cache is streamed, so the full game list is never held
+        in memory.
+        """
         if self.analysis_file.exists():
-            with open(self.analysis_file, 'r') as f:
-                self.analysis = json.load(f)
+            self.analysis = load_json(self.analysis_file)
         else:
             raise FileNotFoundError(f"Analysis file not found: {self.analysis_file}")
 
         if self.games_file.exists():
-            with open(self.games_file, 'r') as f:
-                self.games_data = json.load(f)
+            if ijson is not None:
+                games = self._stream_games()
+            else:
+                games_data = load_json(self.games_file)
+                self.username = games_data.get("username", "")
+                games = games_data.get("games", [])
+
+            # Newest first; same order as a full sort by end time. Shared by
+            # the summary and recent games pages, so it is selected only once.
+            self.recent_games = heapq.nlargest(self.RECENT_GAMES, games, key=_END_TIME)
+
+        # Fields the pages read per game, as lists parallel to recent_games,
+        # so they are extracted, lowercased and classified only once
+        games = self.recent_games
+        self._username_lc = self.username.lower()
+        self._end_times = [g.get("end_time", 0) for g in games]
+        self._white_lc = [g.get("white", {}).get("username", "").lower() for g in games]
+        self._black_lc = [g.get("black", {}).get("username", "").lower() for g in games]
+        self._time_classes = [g.get("time_class", "?") for g in games]
+        self._results = [self._get_result(i) for i in range(len(games))]
+
+    def _stream_games(self) -> Iterator[Dict]:
+        """
+        Yield the cached games one at a time with ijson.
+
+        The cache username is picked up from the same event stream.
+        """
+        def events(f):
+            for prefix, event, value in ijson.parse(f):
+                if prefix == "username" and event == "string":
+                    self.username = value
+                yield prefix, event, value
+
+        with open(self.games_file, 'rb') as f:
+            yield from ijson.items(events(f), "games.item", use_float=True)
 
     def generate_summary(self):
         """Generate summary.md with overall statistics."""
@@ -60,7 +153,7 @@ class MarkdownGenerator:
         else:
             formatted_date = "Unknown"
 
-        content = f"""# Chess Performance Summary for {username}
+        parts = [f"""# Chess Performance Summary for {username}
 
 *Last updated: {formatted_date}*
 
@@ -72,91 +165,88 @@ Total games analyzed: **{total_games}**
 
 | Time Control | Rating |
 |--------------|--------|
-"""
+"""]
         # Add ratings
         ratings = self.analysis.get("rating_progress", {}).get("current_ratings", {})
         for tc, rating in sorted(ratings.items()):
-            tc_display = tc.replace("_", " ").title()
-            content += f"| {tc_display} | **{rating}** |\n"
+            parts.append(_RATING_ROW % (_fmt_label(tc), rating))
 
         # Performance by time control
-        content += "\n## Performance by Time Control\n\n"
+        parts.append("\n## Performance by Time Control\n\n")
         time_controls = self.analysis.get("time_controls", {})
 
         for tc, stats in sorted(time_controls.items(),
                                 key=lambda x: x[1].get("total", 0),
                                 reverse=True):
-            if stats["total"] > 0:
-                tc_display = tc.replace("_", " ").title()
-                win_rate = stats.get("win_rate", 0)
-                content += f"### {tc_display}\n"
-                content += f"- Games: {stats['total']}\n"
-                content += f"- Win rate: {win_rate}%\n"
-                content += f"- Record: {stats['wins']}W / {stats['losses']}L / {stats['draws']}D\n\n"
+            total = stats["total"]
+            if total > 0:
+                win_rate, wins, losses, draws = (stats.get("win_rate", 0), stats["wins"],
+                                                 stats["losses"], stats["draws"])
+                parts.extend((
+                    f"### {_fmt_label(tc)}\n",
+                    f"- Games: {total}\n",
+                    f"- Win rate: {win_rate}%\n",
+                    f"- Record: {wins}W / {losses}L / {draws}D\n\n",
+                ))
 
         # Overall statistics
-        if self.games_data:
-            games = self.games_data.get("games", [])
-            if games:
-                # Recent form (last 20 games)
-                recent_games = sorted(games, key=lambda g: g.get("end_time", 0), reverse=True)[:20]
-                recent_wins = sum(1 for g in recent_games if self._get_result(g) == "win")
-                recent_form = f"{recent_wins}/20"
+        if self.recent_games:
+            # Recent form (up to RECENT_GAMES games; never zero inside this branch)
+            recent_count = len(self.recent_games)
+            recent_wins = self._results.count("win")
+            recent_form = f"{recent_wins}/{recent_count}"
+            recent_rate = round(recent_wins * 100 / recent_count)
 
-                content += f"""## Recent Performance
+            parts.append(f"""## Recent Performance
 
-Last 20 games: **{recent_form}** wins ({recent_wins*5}% win rate)
+Last {recent_count} games: **{recent_form}** wins ({recent_rate}% win rate)
 
 ## Time Management
 
-"""
-                time_usage = self.analysis.get("time_usage", {})
-                timeouts = time_usage.get("timeouts", 0)
-                if total_games > 0:
-                    timeout_rate = (timeouts / total_games) * 100
-                    content += f"- Games lost on time: {timeouts} ({timeout_rate:.1f}%)\n"
-                else:
-                    content += "- No time management data available\n"
-
-                # Ending types
-                endings = time_usage.get("ending_types", {})
-                if endings:
-                    content += "\n### Most Common Game Endings\n\n"
-                    for ending, count in list(endings.items())[:5]:
-                        ending_display = ending.replace("_", " ").title()
-                        content += f"- {ending_display}: {count} games\n"
+""")
+            time_usage = self.analysis.get("time_usage", {})
+            timeouts = time_usage.get("timeouts", 0)
+            if total_games > 0:
+                timeout_rate = (timeouts / total_games) * 100
+                parts.append(f"- Games lost on time: {timeouts} ({timeout_rate:.1f}%)\n")
+            else:
+                parts.append("- No time management data available\n")
+
+            # Ending types
+            endings = time_usage.get("ending_types", {})
+            if endings:
+                parts.append("\n### Most Common Game Endings\n\n")
+                for ending, count in list(endings.items())[:5]:
+                    ending_display = _fmt_label(ending)
+                    parts.append(f"- {ending_display}: {count} games\n")
+
+        content = "".join(parts)
 
         # Save file
         output_file = self.output_dir / "summary.md"
-        with open(output_file, 'w') as f:
-            f.write(content)
-        print(f"Generated: {output_file}")
+        output_file.write_bytes(content.encode("utf-8"))
+        with self._print_lock:
+            print(f"Generated: {output_file}")
 
     def generate_openings(self):
         """Generate openings.md with opening repertoire analysis."""
-        content = f"""# Opening Repertoire Analysis
+        parts = [f"""# Opening Repertoire Analysis
 
 *Based on {self.analysis.get('total_games', 0)} games*
 
 ## Playing as White
 
-"""
+"""]
         # White openings
         white_openings = self.analysis.get("openings", {}).get("white", {})
-        sorted_white = sorted(white_openings.items(),
-                             key=lambda x: x[1].get("total", 0),
-                             reverse=True)
+        top_white = heapq.nlargest(10, white_openings.items(), key=_opening_total)
 
-        if sorted_white:
-            content += "| Opening | Games | Win Rate | Performance |\n"
-            content += "|---------|-------|----------|-------------|\n"
+        if top_white:
+            parts.append(_OPENING_TABLE_HEAD)
 
-            for opening, stats in sorted_white[:10]:  # Top 10
-                total = stats["total"]
-                win_rate = stats.get("win_rate", 0)
-                wins = stats["wins"]
-                losses = stats["losses"]
-                draws = stats["draws"]
+            for opening, stats in top_white:  # Top 10
+                total, win_rate, wins, losses, draws = (stats["total"], stats.get("win_rate", 0),
+                                                        stats["wins"], stats["losses"], stats["draws"])
 
                 # Performance indicator
                 if win_rate >= 60:
@@ -166,25 +256,19 @@ Last 20 games: **{recent_form}** wins ({recent_wins*5}% win rate)
                 else:
                     indicator = "🔴"
 
-                content += f"| {opening} | {total} | {win_rate}% | {indicator} {wins}W/{losses}L/{draws}D |\n"
+                parts.append(_OPENING_ROW % (opening, total, win_rate, indicator, wins, losses, draws))
 
         # Black openings
-        content += "\n## Playing as Black\n\n"
+        parts.append("\n## Playing as Black\n\n")
         black_openings = self.analysis.get("openings", {}).get("black", {})
-        sorted_black = sorted(black_openings.items(),
-                             key=lambda x: x[1].get("total", 0),
-                             reverse=True)
+        top_black = heapq.nlargest(10, black_openings.items(), key=_opening_total)
 
-        if sorted_black:
-            content += "| Opening | Games | Win Rate | Performance |\n"
-            content += "|---------|-------|----------|-------------|\n"
+        if top_black:
+            parts.append(_OPENING_TABLE_HEAD)
 
-            for opening, stats in sorted_black[:10]:  # Top 10
-                total = stats["total"]
-                win_rate = stats.get("win_rate", 0)
-                wins = stats["wins"]
-                losses = stats["losses"]
-                draws = stats["draws"]
+            for opening, stats in top_black:  # Top 10
+                total, win_rate, wins, losses, draws = (stats["total"], stats.get("win_rate", 0),
+                                                        stats["wins"], stats["losses"], stats["draws"])
 
                 # Performance indicator
                 if win_rate >= 55:  # Slightly lower threshold for black
@@ -194,54 +278,56 @@ Last 20 games: **{recent_form}** wins ({recent_wins*5}% win rate)
                 else:
                     indicator = "🔴"
 
-                content += f"| {opening} | {total} | {win_rate}% | {indicator} {wins}W/{losses}L/{draws}D |\n"
+                parts.append(_OPENING_ROW % (opening, total, win_rate, indicator, wins, losses, draws))
 
         # Recommendations
-        content += "\n## Recommendations\n\n"
+        parts.append("\n## Recommendations\n\n")
 
-        # Find best performing openings
-        best_white = None
-        best_black = None
-
-        for opening, stats in sorted_white:
-            if stats["total"] >= 10 and stats.get("win_rate", 0) > 50:
-                best_white = (opening, stats)
-                break
-
-        for opening, stats in sorted_black:
-            if stats["total"] >= 10 and stats.get("win_rate", 0) > 45:
-                best_black = (opening, stats)
-                break
+        # Find best performing openings: the most played one that clears the bar
+        best_white = max((row for row in _opening_rows(white_openings)
+                          if row[1] >= 10 and row[2] > 50),
+                         key=itemgetter(1), default=None)
+        best_black = max((row for row in _opening_rows(black_openings)
+                          if row[1] >= 10 and row[2] > 45),
+                         key=itemgetter(1), default=None)
 
         if best_white:
-            content += f"### Continue with White:\n"
-            content += f"- **{best_white[0]}** - {best_white[1]['win_rate']}% win rate in {best_white[1]['total']} games\n\n"
+            opening, total, win_rate = best_white
+            parts.extend((
+                f"### Continue with White:\n",
+                f"- **{opening}** - {win_rate}% win rate in {total} games\n\n",
+            ))
 
         if best_black:
-            content += f"### Continue with Black:\n"
-            content += f"- **{best_black[0]}** - {best_black[1]['win_rate']}% win rate in {best_black[1]['total']} games\n\n"
+            opening, total, win_rate = best_black
+            parts.extend((
+                f"### Continue with Black:\n",
+                f"- **{opening}** - {win_rate}% win rate in {total} games\n\n",
+            ))
+
+        content = "".join(parts)
 
         # Save file
         output_file = self.output_dir / "openings.md"
-        with open(output_file, 'w') as f:
-            f.write(content)
-        print(f"Generated: {output_file}")
+        output_file.write_bytes(content.encode("utf-8"))
+        with self._print_lock:
+            print(f"Generated: {output_file}")
 
     def generate_weaknesses(self):
         """Generate weaknesses.md with areas for improvement."""
-        content = """# Areas for Improvement
+        parts = ["""# Areas for Improvement
 
 *Identified weaknesses and recommendations based on game analysis*
 
 ## Critical Issues
 
-"""
+"""]
         weaknesses = self.analysis.get("weaknesses", {}).get("identified_weaknesses", [])
 
         if weaknesses:
             for i, weakness in enumerate(weaknesses, 1):
                 if weakness["type"] == "opening":
-                    content += f"""### {i}. Problematic Opening ({weakness['color'].title()})
+                    parts.append(f"""### {i}. Problematic Opening ({weakness['color'].title()})
 
 **Opening:** {weakness['opening']}
 - Games played: {weakness['games']}
@@ -249,9 +335,9 @@ Last 20 games: **{recent_form}** wins ({recent_wins*5}% win rate)
 
 **Recommendation:** Consider studying this opening more deeply or switching to an alternative.
 
-"""
+""")
                 elif weakness["type"] == "time_management":
-                    content += f"""### {i}. Time Management Issues
+                    parts.append(f"""### {i}. Time Management Issues
 
 {weakness['description']}
 
@@ -260,12 +346,12 @@ Last 20 games: **{recent_form}** wins ({recent_wins*5}% win rate)
 - Learn pattern recognition to save time
 - Consider playing longer time controls until improvement
 
-"""
+""")
         else:
-            content += "*No significant weaknesses identified. Keep up the good work!*\n\n"
+            parts.append("*No significant weaknesses identified. Keep up the good work!*\n\n")
 
         # Add general improvement areas based on statistics
-        content += """## General Improvement Areas
+        parts.append("""## General Improvement Areas
 
 ### 1. Opening Preparation
 - Study main lines of your most played openings
@@ -286,121 +372,113 @@ Last 20 games: **{recent_form}** wins ({recent_wins*5}% win rate)
 - Daily tactical puzzles (15-30 minutes)
 - Focus on pattern recognition
 - Practice calculation of forcing variations
-"""
+""")
 
         # Add specific openings to study
-        problem_openings = []
-        for color in ["white", "black"]:
-            openings = self.analysis.get("openings", {}).get(color, {})
-            for opening, stats in openings.items():
-                if stats["total"] >= 5 and stats.get("loss_rate", 0) > 40:
-                    problem_openings.append((opening, color, stats))
+        # The first five that qualify; the scan stops as soon as they are found
+        all_openings = self.analysis.get("openings", {})
+        problem_openings = list(islice(
+            ((opening, color, stats)
+             for color in ("white", "black")
+             for opening, stats in all_openings.get(color, {}).items()
+             if stats["total"] >= 5 and stats.get("loss_rate", 0) > 40),
+            5))
 
         if problem_openings:
-            content += "\n## Specific Openings to Study\n\n"
-            for opening, color, stats in problem_openings[:5]:
-                content += f"- **{opening}** (as {color}): "
-                content += f"{stats['loss_rate']}% loss rate in {stats['total']} games\n"
+            parts.append("\n## Specific Openings to Study\n\n")
+            for opening, color, stats in problem_openings:
+                parts.extend((
+                    f"- **{opening}** (as {color}): ",
+                    f"{stats['loss_rate']}% loss rate in {stats['total']} games\n",
+                ))
+
+        content = "".join(parts)
 
         # Save file
         output_file = self.output_dir / "weaknesses.md"
-        with open(output_file, 'w') as f:
-            f.write(content)
-        print(f"Generated: {output_file}")
+        output_file.write_bytes(content.encode("utf-8"))
+        with self._print_lock:
+            print(f"Generated: {output_file}")
 
     def generate_recent_games(self):
         """Generate recent_games.md with latest games for reference."""
-        content = """# Recent Games
+        parts = [f"""# Recent Games
 
-*Last 20 games with key details*
+*Last {len(self.recent_games)} games with key details*
 
 | Date | Opponent | Rating | Color | Result | Opening | Time Control | Link |
 |------|----------|--------|-------|--------|---------|--------------|------|
-"""
-        if self.games_data:
-            games = self.games_data.get("games", [])
-            username = self.games_data.get("username", "").lower()
-
-            # Sort by end time and get last 20
-            recent = sorted(games, key=lambda g: g.get("end_time", 0), reverse=True)[:20]
-
-            for game in recent:
-                # Extract data
-                end_time = game.get("end_time", 0)
-                date = datetime.fromtimestamp(end_time).strftime("%Y-%m-%d") if end_time else "N/A"
-
-                # Determine color and opponent
-                white_player = game.get("white", {}).get("username", "").lower()
-                black_player = game.get("black", {}).get("username", "").lower()
-
-                if white_player == username:
-                    color = "⚪"
-                    opponent = game.get("black", {}).get("username", "Unknown")
-                    opponent_rating = game.get("black", {}).get("rating", "?")
-                    result = self._format_result(game.get("white", {}).get("result", ""))
-                else:
-                    color = "⚫"
-                    opponent = game.get("white", {}).get("username", "Unknown")
-                    opponent_rating = game.get("white", {}).get("rating", "?")
-                    result = self._format_result(game.get("black", {}).get("result", ""))
-
-                # Get opening (simplified)
-                opening = self._get_opening_simple(game)
-                time_control = game.get("time_class", "?").replace("_", " ").title()
-                url = game.get("url", "#")
-
-                # Format result with emoji
-                if "win" in result.lower():
-                    result_display = "✅ Won"
-                elif "loss" in result.lower() or "resign" in result.lower() or "timeout" in result.lower():
-                    result_display = "❌ Lost"
-                else:
-                    result_display = "➖ Draw"
-
-                content += f"| {date} | {opponent} | {opponent_rating} | {color} | {result_display} | {opening} | {time_control} | [View]({url}) |\n"
+"""]
+        username = self._username_lc
+        recent = self.recent_games
+        for i, game in enumerate(recent):
+            # Extract data
+            end_time = self._end_times[i]
+
+            # Determine color and opponent
+            if self._white_lc[i] == username:
+                color = "⚪"
+                opponent = game.get("black", {})
+            else:
+                color = "⚫"
+                opponent = game.get("white", {})
+
+            row = {
+                "date": date.fromtimestamp(end_time).isoformat() if end_time else "N/A",
+                "opponent": opponent.get("username", "Unknown"),
+                "opp_rating": opponent.get("rating", "?"),
+                "color": color,
+                "result": _RESULT_EMOJI.get(self._results[i], "➖ Draw"),
+                "opening": self._get_opening_simple(game),
+                "tc": _fmt_label(self._time_classes[i]),
+                "url": game.get("url", "#"),
+            }
+            parts.append(_ROW_TMPL.format_map(row))
 
         # Add analysis section
-        content += """
+        parts.append("""
 
 ## Quick Stats from Recent Games
 
-"""
+""")
         if recent:
-            recent_wins = sum(1 for g in recent if "win" in self._get_result_str(g))
-            recent_losses = sum(1 for g in recent if "loss" in self._get_result_str(g))
+            recent_wins = self._results.count("win")
+            recent_losses = self._results.count("loss")
             recent_draws = len(recent) - recent_wins - recent_losses
 
-            content += f"- **Record:** {recent_wins}W / {recent_losses}L / {recent_draws}D\n"
-            content += f"- **Win rate:** {(recent_wins/len(recent)*100):.1f}%\n"
+            parts.extend((
+                f"- **Record:** {recent_wins}W / {recent_losses}L / {recent_draws}D\n",
+                f"- **Win rate:** {(recent_wins/len(recent)*100):.1f}%\n",
+            ))
 
             # Most faced opponent
-            opponents = {}
-            for g in recent:
-                white = g.get("white", {}).get("username", "")
-                black = g.get("black", {}).get("username", "")
-                opp = white if black.lower() == username else black
+            opponents = Counter()
+            for game, black_lc in zip(recent, self._black_lc):
+                opp_side = "white" if black_lc == username else "black"
+                opp = game.get(opp_side, {}).get("username", "")
                 if opp:
-                    opponents[opp] = opponents.get(opp, 0) + 1
+                    opponents[opp] += 1
 
             if opponents:
-                most_played = max(opponents.items(), key=lambda x: x[1])
-                content += f"- **Most faced:** {most_played[0]} ({most_played[1]} games)\n"
+                most_played = opponents.most_common(1)[0]
+                parts.append(f"- **Most faced:** {most_played[0]} ({most_played[1]} games)\n")
+
+        content = "".join(parts)
 
         # Save file
         output_file = self.output_dir / "recent_games.md"
-        with open(output_file, 'w') as f:
-            f.write(content)
-        print(f"Generated: {output_file}")
+        output_file.write_bytes(content.encode("utf-8"))
+        with self._print_lock:
+            print(f"Generated: {output_file}")
 
-    def _get_result(self, game: Dict) -> str:
-        """Helper to get game result."""
-        username = self.games_data.get("username", "").lower()
-        white_player = game.get("white", {}).get("username", "").lower()
-        black_player = game.get("black", {}).get("username", "").lower()
+    def _get_result(self, i: int) -> str:
+        """Helper to get the result of the i-th recent game."""
+        username = self._username_lc
+        game = self.recent_games[i]
 
-        if white_player == username:
+        if self._white_lc[i] == username:
             result = game.get("white", {}).get("result", "")
-        elif black_player == username:
+        elif self._black_lc[i] == username:
             result = game.get("black", {}).get("result", "")
         else:
             return "unknown"
@@ -412,39 +490,11 @@ Last 20 games: **{recent_form}** wins ({recent_wins*5}% win rate)
         else:
             return "draw"
 
-    def _get_result_str(self, game: Dict) -> str:
-        """Helper to get result string."""
-        result = self._get_result(game)
-        return result
-
-    def _format_result(self, result: str) -> str:
-        """Format result string for display."""
-        if "win" in result:
-            return "Won"
-        elif "agreed" in result:
-            return "Draw"
-        elif "repetition" in result:
-            return "Draw (repetition)"
-        elif "insufficient" in result:
-            return "Draw (insufficient)"
-        elif "timeout" in result:
-            return "Lost (timeout)"
-        elif "resigned" in result:
-            return "Lost (resigned)"
-        elif "checkmated" in result:
-            return "Lost (checkmate)"
-        elif "abandoned" in result:
-            return "Lost (abandoned)"
-        else:
-            return result
-
     def _get_opening_simple(self, game: Dict) -> str:
         """Extract opening name from game (simplified)."""
-        pgn = game.get("pgn", "")
-        if "[Opening " in pgn:
-            start = pgn.index("[Opening ") + 9
-            end = pgn.index("]", start)
-            opening = pgn[start:end].strip('"')
+        match = _OPENING_RE.search(game.get("pgn", ""))
+        if match:
+            opening = match.group(1).strip('"')
             # Shorten if too long
             if len(opening) > 20:
                 opening = opening[:17] + "..."
@@ -454,10 +504,14 @@ Last 20 games: **{recent_form}** wins ({recent_wins*5}% win rate)
     def generate_all(self):
         """Generate all Markdown files."""
         print("\nGenerating Markdown files...")
-        self.generate_summary()
-        self.generate_openings()
-        self.generate_weaknesses()
-        self.generate_recent_games()
+
+        # Each page only reads the loaded data and writes its own file, so the
+        # pages can be built and written concurrently
+        pages = (self.generate_summary, self.generate_openings,
+                 self.generate_weaknesses, self.generate_recent_games)
+        with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            for future in [executor.submit(page) for page in pages]:
+                future.result()  # Re-raise any error from the page
         print(f"\nAll files generated in: {self.output_dir}/")
 
 
@@ -3,13 +3,209 @@
 Initialize the coach memory system with baseline data
 """
 
-import json
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from functools import partial
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
-def create_directory_structure():
+from json_io import dump_json
+
+KNOWLEDGE_DIR = Path(__file__).parent.parent / "knowledge"
+
+@dataclass(frozen=True, slots=True)
+class Weakness:
+    """An entry of current_state's active weaknesses"""
+    area: str
+    severity: str
+    games_affected: int
+    improvement_rate: float = 0.0
+    first_identified: str = ""
+    last_reviewed: Optional[str] = None
+    exercises_assigned: int = 0
+    exercises_completed: int = 0
+    specific_issues: List[str] = field(default_factory=list)
+
+# Weaknesses found by the game analysis
+BASELINE_WEAKNESSES = (
+    Weakness("time_management", "critical", 14, specific_issues=[
+        "Spending too much time in opening",
+        "Panic in time pressure",
+        "Not using increment effectively"
+    ]),
+    Weakness("endgame_conversion", "moderate", 8, specific_issues=[
+        "Struggling with rook endgames",
+        "Missing winning continuations",
+        "Drawing won positions"
+    ]),
+    Weakness("opening_preparation", "moderate", 35, specific_issues=[
+        "Weak against 1.e4 (42% win rate)",
+        "No repertoire against Sicilian",
+        "Mixing up move orders"
+    ]),
+)
+
+# Static parts of the baseline files. They are built once at import and
+# shared by every run; the writers only serialize them, never mutate them.
+BASELINE_METRICS = {
+    "rating": {
+        "rapid_start": 731,
+        "rapid_current": 763,
+        "rapid_change": 32,
+        "daily_start": 676,
+        "daily_current": 676,
+        "daily_change": 0,
+        "trend": "improving"
+    },
+    "tactics": {
+        "estimated_rating": 1200,
+        "accuracy_rate": None,
+        "patterns_recognized": ["forks", "pins", "basic_checkmates"],
+        "patterns_learning": ["discovered_attacks", "deflection"]
+    },
+    "time_management": {
+        "avg_time_per_move": 45,
+        "time_pressure_losses": 14,
+        "games_lost_on_time": 14,
+        "improvement_target": "Reduce by 50%"
+    },
+    "opening_knowledge": {
+        "repertoire_size": 5,
+        "main_openings": {
+            "white": ["Italian Game", "Scotch Game"],
+            "black": ["Philidor Defense", "Sicilian (learning)"]
+        },
+        "accuracy_first_10_moves": 0.68,
+        "theory_depth": "5-8 moves",
+        "problem_openings": ["French Defense", "Caro-Kann"]
+    },
+    "endgame_skill": {
+        "conversion_rate": 0.65,
+        "drawn_won_positions": 8,
+        "basic_checkmates": "inconsistent",
+        "pawn_endgames": "beginner",
+        "rook_endgames": "struggling"
+    },
+    "psychological": {
+        "tilt_resistance": "moderate",
+        "comeback_ability": "good",
+        "pressure_handling": "needs_work"
+    }
+}
+
+IMPROVEMENT_VELOCITY = {
+    "last_30_days": "+32 rating points",
+    "projection_next_30": "+25-40 points",
+    "limiting_factors": ["time_management", "endgame_technique"]
+}
+
+FOUNDATION_TOPICS = [
+    {
+        "name": "Time Management Fundamentals",
+        "status": "not_started",
+        "lessons": [
+            "Understanding time allocation",
+            "Critical moments identification",
+            "Using increment effectively",
+            "Practical exercises"
+        ]
+    },
+    {
+        "name": "Basic Endgame Patterns",
+        "status": "not_started",
+        "lessons": [
+            "King and Pawn vs King",
+            "Basic checkmates review",
+            "Rook endgame principles",
+            "Practical positions"
+        ]
+    }
+]
+
+LOCKED_MODULES = [
+    {
+        "id": 2,
+        "name": "Opening Consolidation",
+        "status": "locked",
+        "unlock_criteria": "Complete Foundation Repair",
+        "topics": [
+            {
+                "name": "Sicilian Defense for Black",
+                "lessons": [
+                    "Basic Sicilian structures",
+                    "Dragon variation basics",
+                    "Common tactical patterns",
+                    "Model games"
+                ]
+            },
+            {
+                "name": "1.e4 repertoire for White",
+                "lessons": [
+                    "Italian Game mastery",
+                    "Scotch Game improvement",
+                    "Anti-Sicilian options"
+                ]
+            }
+        ]
+    },
+    {
+        "id": 3,
+        "name": "Tactical Sharpening",
+        "status": "locked",
+        "unlock_criteria": "Complete Opening Consolidation",
+        "topics": [
+            "Advanced tactical patterns",
+            "Calculation training",
+            "Defensive tactics",
+            "Tactical endgames"
+        ]
+    }
+]
+
+SELF_PACED_RESOURCES = [
+    {
+        "type": "book",
+        "title": "The Complete Chess Course by Fred Reinfeld",
+        "chapters": "Review chapters 1-3",
+        "priority": "medium",
+        "progress": "not_started"
+    },
+    {
+        "type": "puzzle_set",
+        "title": "Daily Tactical Training",
+        "description": "10 puzzles per day on Chess.com or Lichess",
+        "priority": "high",
+        "streak": 0
+    }
+]
+
+STUDY_SCHEDULE = {
+    "recommended_hours_per_week": 7,
+    "distribution": {
+        "game_play": "40%",
+        "analysis": "30%",
+        "puzzles": "20%",
+        "theory": "10%"
+    }
+}
+
+def _write(data: Dict, file_path: Path, indent: bool, compress: bool) -> str:
+    """Write one coach memory file and return its status line"""
+    gz_path = file_path.with_name(file_path.name + ".gz")
+    if compress:
+        file_path, stale_path = gz_path, file_path
+    else:
+        stale_path = gz_path
+    status = "Created" if dump_json(data, file_path, indent=indent) else "Unchanged"
+    # Readers prefer the plain file, so the other form must not linger
+    stale_path.unlink(missing_ok=True)
+    return f"{status}: {file_path}"
+
+def create_directory_structure(base_dir: Path):
     """Create the necessary directories for coach memory"""
-    base_dir = Path(__file__).parent.parent / "knowledge"
 
     directories = [
         "player_profile",
@@ -19,17 +215,43 @@ def create_directory_structure():
         "checkpoints"
     ]
 
-    for dir_name in directories:
-        dir_path = base_dir / dir_name
-        dir_path.mkdir(exist_ok=True)
-        print(f"Created directory: {dir_path}")
+    # One directory listing tells which ones are missing, instead of a
+    # mkdir attempt per directory on every re-run
+    existing = set()
+    if base_dir.is_dir():
+        with os.scandir(base_dir) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
+    else:
+        base_dir.mkdir(parents=True)
+
+    missing = [dir_name for dir_name in directories if dir_name not in existing]
+    for dir_name in missing:
+        (base_dir / dir_name).mkdir(exist_ok=True)
+
+    if missing:
+        print("\n".join(f"Created directory: {base_dir / dir_name}" for dir_name in missing))
+    else:
+        print(f"All directories already exist in {base_dir}")
 
-def initialize_current_state():
-    """Create initial current_state.json"""
+def initialize_current_state(base_dir: Path, now: datetime, indent: bool = False,
+                             compress: bool = False) -> str:
+    """
+    Create initial current_state.json
+
+    Args:
+        base_dir: Knowledge directory to write into
+        now: Time of this initialization run, shared by every file
+        indent: Pretty-print the JSON
+        compress: Write a gzip-compressed .json.gz file instead
+
+    Returns:
+        Status line for the written file
+    """
+    timestamp = now.isoformat()
 
     current_state = {
         "player_id": "sergioquesadas",
-        "last_updated": datetime.now().isoformat(),
+        "last_updated": timestamp,
         "last_session": None,
         "total_sessions": 0,
         "account_created": "2025-11-15",  # Approximate
@@ -47,51 +269,8 @@ def initialize_current_state():
             "opening_work": "sicilian_defense"
         },
         "active_weaknesses": [
-            {
-                "area": "time_management",
-                "severity": "critical",
-                "games_affected": 14,
-                "improvement_rate": 0.0,
-                "first_identified": datetime.now().isoformat(),
-                "last_reviewed": None,
-                "exercises_assigned": 0,
-                "exercises_completed": 0,
-                "specific_issues": [
-                    "Spending too much time in opening",
-                    "Panic in time pressure",
-                    "Not using increment effectively"
-                ]
-            },
-            {
-                "area": "endgame_conversion",
-                "severity": "moderate",
-                "games_affected": 8,
-                "improvement_rate": 0.0,
-                "first_identified": datetime.now().isoformat(),
-                "last_reviewed": None,
-                "exercises_assigned": 0,
-                "exercises_completed": 0,
-                "specific_issues": [
-                    "Struggling with rook endgames",
-                    "Missing winning continuations",
-                    "Drawing won positions"
-                ]
-            },
-            {
-                "area": "opening_preparation",
-                "severity": "moderate",
-                "games_affected": 35,
-                "improvement_rate": 0.0,
-                "first_identified": datetime.now().isoformat(),
-                "last_reviewed": None,
-                "exercises_assigned": 0,
-                "exercises_completed": 0,
-                "specific_issues": [
-                    "Weak against 1.e4 (42% win rate)",
-                    "No repertoire against Sicilian",
-                    "Mixing up move orders"
-                ]
-            }
+            asdict(replace(weakness, first_identified=timestamp))
+            for weakness in BASELINE_WEAKNESSES
         ],
         "strengths": [
             {
@@ -127,13 +306,22 @@ def initialize_current_state():
         }
     }
 
-    file_path = Path(__file__).parent.parent / "knowledge" / "player_profile" / "current_state.json"
-    with open(file_path, 'w') as f:
-        json.dump(current_state, f, indent=2)
-    print(f"Created: {file_path}")
+    file_path = base_dir / "player_profile" / "current_state.json"
+    return _write(current_state, file_path, indent, compress)
+
+def initialize_training_history(base_dir: Path, indent: bool = False,
+                                compress: bool = False) -> str:
+    """
+    Create initial training_history.json
+
+    Args:
+        base_dir: Knowledge directory to write into
+        indent: Pretty-print the JSON
+        compress: Write a gzip-compressed .json.gz file instead
 
-def initialize_training_history():
-    """Create initial training_history.json"""
+    Returns:
+        Status line for the written file
+    """
 
     training_history = {
         "sessions": [],
@@ -154,66 +342,37 @@ def initialize_training_history():
         "average_session_duration": 45
     }
 
-    file_path = Path(__file__).parent.parent / "knowledge" / "player_profile" / "training_history.json"
-    with open(file_path, 'w') as f:
-        json.dump(training_history, f, indent=2)
-    print(f"Created: {file_path}")
+    file_path = base_dir / "player_profile" / "training_history.json"
+    return _write(training_history, file_path, indent, compress)
+
+def initialize_progress_metrics(base_dir: Path, now: datetime, indent: bool = False,
+                                compress: bool = False) -> str:
+    """
+    Create initial progress_metrics.json based on game analysis
+
+    Args:
+        base_dir: Knowledge directory to write into
+        now: Time of this initialization run, shared by every file
+        indent: Pretty-print the JSON
+        compress: Write a gzip-compressed .json.gz file instead
 
-def initialize_progress_metrics():
-    """Create initial progress_metrics.json based on game analysis"""
+    Returns:
+        Status line for the written file
+    """
+    timestamp = now.isoformat()
+    reached_750 = (now - timedelta(days=10)).isoformat()
+    in_30_days = (now + timedelta(days=30)).isoformat()
+    in_45_days = (now + timedelta(days=45)).isoformat()
+    in_60_days = (now + timedelta(days=60)).isoformat()
 
     progress_metrics = {
-        "baseline_date": datetime.now().isoformat(),
+        "baseline_date": timestamp,
         "overall_improvement_rate": 0.0,
-        "last_calculated": datetime.now().isoformat(),
-        "metrics": {
-            "rating": {
-                "rapid_start": 731,
-                "rapid_current": 763,
-                "rapid_change": 32,
-                "daily_start": 676,
-                "daily_current": 676,
-                "daily_change": 0,
-                "trend": "improving"
-            },
-            "tactics": {
-                "estimated_rating": 1200,
-                "accuracy_rate": None,
-                "patterns_recognized": ["forks", "pins", "basic_checkmates"],
-                "patterns_learning": ["discovered_attacks", "deflection"]
-            },
-            "time_management": {
-                "avg_time_per_move": 45,
-                "time_pressure_losses": 14,
-                "games_lost_on_time": 14,
-                "improvement_target": "Reduce by 50%"
-            },
-            "opening_knowledge": {
-                "repertoire_size": 5,
-                "main_openings": {
-                    "white": ["Italian Game", "Scotch Game"],
-                    "black": ["Philidor Defense", "Sicilian (learning)"]
-                },
-                "accuracy_first_10_moves": 0.68,
-                "theory_depth": "5-8 moves",
-                "problem_openings": ["French Defense", "Caro-Kann"]
-            },
-            "endgame_skill": {
-                "conversion_rate": 0.65,
-                "drawn_won_positions": 8,
-                "basic_checkmates": "inconsistent",
-                "pawn_endgames": "beginner",
-                "rook_endgames": "struggling"
-            },
-            "psychological": {
-                "tilt_resistance": "moderate",
-                "comeback_ability": "good",
-                "pressure_handling": "needs_work"
-            }
-        },
+        "last_calculated": timestamp,
+        "metrics": BASELINE_METRICS,
         "milestones_achieved": [
             {
-                "date": (datetime.now() - timedelta(days=10)).isoformat(),
+                "date": reached_750,
                 "achievement": "Reached 750+ rapid rating",
                 "category": "rating"
             }
@@ -221,37 +380,44 @@ def initialize_progress_metrics():
         "next_milestones": [
             {
                 "target": "800 rapid rating",
-                "estimated_date": (datetime.now() + timedelta(days=30)).isoformat(),
+                "estimated_date": in_30_days,
                 "requirements": ["Improve time management", "Solidify openings"]
             },
             {
                 "target": "Master basic endgames",
-                "estimated_date": (datetime.now() + timedelta(days=45)).isoformat(),
+                "estimated_date": in_45_days,
                 "requirements": ["Study K+P vs K", "Practice rook endgames"]
             },
             {
                 "target": "Complete Sicilian Defense repertoire",
-                "estimated_date": (datetime.now() + timedelta(days=60)).isoformat(),
+                "estimated_date": in_60_days,
                 "requirements": ["Learn main lines", "Practice in games"]
             }
         ],
-        "improvement_velocity": {
-            "last_30_days": "+32 rating points",
-            "projection_next_30": "+25-40 points",
-            "limiting_factors": ["time_management", "endgame_technique"]
-        }
+        "improvement_velocity": IMPROVEMENT_VELOCITY
     }
 
-    file_path = Path(__file__).parent.parent / "knowledge" / "player_profile" / "progress_metrics.json"
-    with open(file_path, 'w') as f:
-        json.dump(progress_metrics, f, indent=2)
-    print(f"Created: {file_path}")
+    file_path = base_dir / "player_profile" / "progress_metrics.json"
+    return _write(progress_metrics, file_path, indent, compress)
+
+def initialize_curriculum(base_dir: Path, now: datetime, indent: bool = False,
+                          compress: bool = False) -> str:
+    """
+    Create initial learning curriculum
+
+    Args:
+        base_dir: Knowledge directory to write into
+        now: Time of this initialization run, shared by every file
+        indent: Pretty-print the JSON
+        compress: Write a gzip-compressed .json.gz file instead
 
-def initialize_curriculum():
-    """Create initial learning curriculum"""
+    Returns:
+        Status line for the written file
+    """
+    timestamp = now.isoformat()
 
     curriculum = {
-        "created": datetime.now().isoformat(),
+        "created": timestamp,
         "level": "advanced_beginner",
         "estimated_rating_range": "700-800",
         "current_module": 1,
@@ -260,68 +426,11 @@ def initialize_curriculum():
                 "id": 1,
                 "name": "Foundation Repair",
                 "status": "in_progress",
-                "started": datetime.now().isoformat(),
+                "started": timestamp,
                 "progress": 0.0,
-                "topics": [
-                    {
-                        "name": "Time Management Fundamentals",
-                        "status": "not_started",
-                        "lessons": [
-                            "Understanding time allocation",
-                            "Critical moments identification",
-                            "Using increment effectively",
-                            "Practical exercises"
-                        ]
-                    },
-                    {
-                        "name": "Basic Endgame Patterns",
-                        "status": "not_started",
-                        "lessons": [
-                            "King and Pawn vs King",
-                            "Basic checkmates review",
-                            "Rook endgame principles",
-                            "Practical positions"
-                        ]
-                    }
-                ]
+                "topics": FOUNDATION_TOPICS
             },
-            {
-                "id": 2,
-                "name": "Opening Consolidation",
-                "status": "locked",
-                "unlock_criteria": "Complete Foundation Repair",
-                "topics": [
-                    {
-                        "name": "Sicilian Defense for Black",
-                        "lessons": [
-                            "Basic Sicilian structures",
-                            "Dragon variation basics",
-                            "Common tactical patterns",
-                            "Model games"
-                        ]
-                    },
-                    {
-                        "name": "1.e4 repertoire for White",
-                        "lessons": [
-                            "Italian Game mastery",
-                            "Scotch Game improvement",
-                            "Anti-Sicilian options"
-                        ]
-                    }
-                ]
-            },
-            {
-                "id": 3,
-                "name": "Tactical Sharpening",
-                "status": "locked",
-                "unlock_criteria": "Complete Opening Consolidation",
-                "topics": [
-                    "Advanced tactical patterns",
-                    "Calculation training",
-                    "Defensive tactics",
-                    "Tactical endgames"
-                ]
-            }
+            *LOCKED_MODULES
         ],
         "recommended_resources": [
             {
@@ -329,7 +438,7 @@ def initialize_curriculum():
                 "title": "Time Management for Club Players - IM Andras Toth",
                 "url": "https://www.youtube.com/watch?v=...",
                 "priority": "high",
-                "assigned": datetime.now().isoformat(),
+                "assigned": timestamp,
                 "completed": False
             },
             {
@@ -337,42 +446,30 @@ def initialize_curriculum():
                 "title": "Lichess Endgame Practice",
                 "url": "https://lichess.org/practice/basic-checkmates",
                 "priority": "high",
-                "assigned": datetime.now().isoformat(),
+                "assigned": timestamp,
                 "completed": False
             },
-            {
-                "type": "book",
-                "title": "The Complete Chess Course by Fred Reinfeld",
-                "chapters": "Review chapters 1-3",
-                "priority": "medium",
-                "progress": "not_started"
-            },
-            {
-                "type": "puzzle_set",
-                "title": "Daily Tactical Training",
-                "description": "10 puzzles per day on Chess.com or Lichess",
-                "priority": "high",
-                "streak": 0
-            }
+            *SELF_PACED_RESOURCES
         ],
-        "study_schedule": {
-            "recommended_hours_per_week": 7,
-            "distribution": {
-                "game_play": "40%",
-                "analysis": "30%",
-                "puzzles": "20%",
-                "theory": "10%"
-            }
-        }
+        "study_schedule": STUDY_SCHEDULE
     }
 
-    file_path = Path(__file__).parent.parent / "knowledge" / "learning_paths" / "current_curriculum.json"
-    with open(file_path, 'w') as f:
-        json.dump(curriculum, f, indent=2)
-    print(f"Created: {file_path}")
+    file_path = base_dir / "learning_paths" / "current_curriculum.json"
+    return _write(curriculum, file_path, indent, compress)
+
+def initialize_session_index(base_dir: Path, indent: bool = False,
+                             compress: bool = False) -> str:
+    """
+    Create initial session index
 
-def initialize_session_index():
-    """Create initial session index"""
+    Args:
+        base_dir: Knowledge directory to write into
+        indent: Pretty-print the JSON
+        compress: Write a gzip-compressed .json.gz file instead
+
+    Returns:
+        Status line for the written file
+    """
 
     session_index = {
         "total_sessions": 0,
@@ -382,63 +479,81 @@ def initialize_session_index():
         "average_session_length": 0
     }
 
-    file_path = Path(__file__).parent.parent / "knowledge" / "session_logs" / "sessions_index.json"
-    with open(file_path, 'w') as f:
-        json.dump(session_index, f, indent=2)
-    print(f"Created: {file_path}")
+    file_path = base_dir / "session_logs" / "sessions_index.json"
+    return _write(session_index, file_path, indent, compress)
+
+def initialize_weakness_timeline(base_dir: Path, now: datetime, indent: bool = False,
+                                 compress: bool = False) -> str:
+    """
+    Create initial weakness evolution tracking
+
+    Args:
+        base_dir: Knowledge directory to write into
+        now: Time of this initialization run, shared by every file
+        indent: Pretty-print the JSON
+        compress: Write a gzip-compressed .json.gz file instead
 
-def initialize_weakness_timeline():
-    """Create initial weakness evolution tracking"""
+    Returns:
+        Status line for the written file
+    """
+    timestamp = now.isoformat()
 
     weakness_timeline = {
-        "tracking_started": datetime.now().isoformat(),
+        "tracking_started": timestamp,
         "weaknesses": {
-            "time_management": {
+            weakness.area: {
                 "severity_history": [
-                    {"date": datetime.now().isoformat(), "severity": "critical", "games_affected": 14}
-                ],
-                "interventions": [],
-                "improvement_rate": 0.0
-            },
-            "endgame_conversion": {
-                "severity_history": [
-                    {"date": datetime.now().isoformat(), "severity": "moderate", "games_affected": 8}
-                ],
-                "interventions": [],
-                "improvement_rate": 0.0
-            },
-            "opening_preparation": {
-                "severity_history": [
-                    {"date": datetime.now().isoformat(), "severity": "moderate", "games_affected": 35}
+                    {"date": timestamp, "severity": weakness.severity,
+                     "games_affected": weakness.games_affected}
                 ],
                 "interventions": [],
                 "improvement_rate": 0.0
             }
+            for weakness in BASELINE_WEAKNESSES
         },
         "resolved_weaknesses": []
     }
 
-    file_path = Path(__file__).parent.parent / "knowledge" / "analysis_evolution" / "weakness_timeline.json"
-    with open(file_path, 'w') as f:
-        json.dump(weakness_timeline, f, indent=2)
-    print(f"Created: {file_path}")
+    file_path = base_dir / "analysis_evolution" / "weakness_timeline.json"
+    return _write(weakness_timeline, file_path, indent, compress)
 
 def main():
     """Initialize all coach memory components"""
+    parser = argparse.ArgumentParser(description="Initialize the coach memory system")
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the JSON files for reading by hand (default: compact)"
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Write gzip-compressed .json.gz files"
+    )
+    args = parser.parse_args()
 
     print("Initializing Coach Memory System...")
     print("=" * 50)
 
     # Create directory structure
-    create_directory_structure()
-
-    # Initialize all JSON files
-    initialize_current_state()
-    initialize_training_history()
-    initialize_progress_metrics()
-    initialize_curriculum()
-    initialize_session_index()
-    initialize_weakness_timeline()
+    create_directory_structure(KNOWLEDGE_DIR)
+
+    # Initialize all JSON files, stamped with a single clock reading. Each
+    # writer builds and writes its own file, so they run concurrently.
+    now = datetime.now()
+    writers = (
+        partial(initialize_current_state, KNOWLEDGE_DIR, now, indent=args.pretty, compress=args.gzip),
+        partial(initialize_training_history, KNOWLEDGE_DIR, indent=args.pretty, compress=args.gzip),
+        partial(initialize_progress_metrics, KNOWLEDGE_DIR, now, indent=args.pretty, compress=args.gzip),
+        partial(initialize_curriculum, KNOWLEDGE_DIR, now, indent=args.pretty, compress=args.gzip),
+        partial(initialize_session_index, KNOWLEDGE_DIR, indent=args.pretty, compress=args.gzip),
+        partial(initialize_weakness_timeline, KNOWLEDGE_DIR, now, indent=args.pretty, compress=args.gzip),
+    )
+    with ThreadPoolExecutor(max_workers=len(writers)) as executor:
+        # Status lines come back in writer order and are printed together,
+        # so output from the threads never interleaves
+        status_lines = list(executor.map(lambda writer: writer(), writers))
+    print("\n".join(status_lines))
 
     print("=" * 50)
     print("✅ Coach Memory System initialized successfully!")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+JSON file helpers shared by the pipeline scripts.
+
+orjson is used when it is installed; otherwise everything falls back to
+the standard library json module, so the scripts keep working with only
+requirements.txt installed. Files whose name ends in .gz are gzip
+compressed.
+"""
+
+import gzip
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson  # Optional: much faster parsing of large caches
+except ImportError:
+    orjson = None
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    Load a JSON file.
+
+    Args:
+        path: JSON file to read
+
+    Returns:
+        Decoded data
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        return loads_json(gzip.decompress(path.read_bytes()))
+
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(b"")  # mmap cannot map an empty file
+
+            # Parse straight from the page cache instead of copying the
+            # whole file into a bytes object first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def dump_json(data: Any, path: Union[str, Path], indent: bool = True) -> bool:
+    """
+    Write data to a JSON file.
+
+    The document is encoded in full first and then written to a temporary
+    file that replaces the target, so an interrupted run never leaves a
+    truncated file behind. A file that already holds exactly these bytes is
+    left untouched.
+
+    Args:
+        data: JSON-serializable data
+        path: Destination file
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    encoded = dumps_json(data, indent)
+
+    path = Path(path)
+    if path.suffix == ".gz":
+        # Fastest level; a fixed mtime keeps the output reproducible, so
+        # unchanged data still compares equal below
+        encoded = gzip.compress(encoded, compresslevel=1, mtime=0)
+
+    try:
+        # Only read the old contents back when the sizes already match
+        if path.stat().st_size == len(encoded) and path.read_bytes() == encoded:
+            return False
+    except FileNotFoundError:
+        pass
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(encoded)
+    os.replace(tmp_path, path)
+    return True
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """
+    Encode data as JSON bytes.
+
+    Args:
+        data: JSON-serializable data
+        indent: Pretty-print with two-space indentation instead of compact output
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+
+    # Same layout as orjson: raw UTF-8 text and no spaces after separators
+    # when compact. Floats may still differ in exponent form (1e+20 vs 1e20).
+    return (json.dumps(data, indent=2, ensure_ascii=False) if indent
+            else json.dumps(data, separators=(",", ":"), ensure_ascii=False)).encode()
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON from bytes or text.
+
+    Args:
+        data: Encoded JSON
+
+    Returns:
+        Decoded data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
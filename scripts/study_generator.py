@@ -134,6 +134,11 @@ class StudyGenerator:
 
     def _add_analysis_to_pgn(self, pgn: str, analysis: Dict) -> str:
         """Add analysis comments to PGN."""
+        # Nothing to annotate: skip parsing and re-exporting the game
+        if ("accuracy" not in analysis and not analysis.get("blunders")
+                and not analysis.get("mistakes")):
+            return pgn
+
         try:
             game = chess.pgn.read_game(StringIO(pgn))
             if not game:
@@ -143,33 +148,23 @@ class StudyGenerator:
             if "accuracy" in analysis:
                 game.comment = f"Accuracy: {analysis['accuracy']}%"
 
-            # Add move-level comments for mistakes and blunders
-            node = game
-            move_num = 0
-
-            for move in game.mainline():
-                move_num += 1
-
+            # Add move-level comments for mistakes and blunders directly to
+            # the parsed mainline instead of rebuilding it move by move
+            for move_num, node in enumerate(game.mainline(), 1):
                 # Check if this move is in the analysis
                 for blunder in analysis.get("blunders", []):
                     if blunder.get("move_number", 0) == (move_num + 1) // 2:
-                        node = node.add_variation(move)
                         node.comment = f"Blunder! Loses {blunder['eval_loss']} centipawns"
                         break
                 else:
                     for mistake in analysis.get("mistakes", []):
                         if mistake.get("move_number", 0) == (move_num + 1) // 2:
-                            node = node.add_variation(move)
                             node.comment = f"Mistake. Loses {mistake['eval_loss']} centipawns"
                             break
-                    else:
-                        node = node.add_variation(move)
 
             # Convert back to PGN string
-            output = StringIO()
-            exporter = chess.pgn.FileExporter(output)
-            game.accept(exporter)
-            return output.getvalue()
+            exporter = chess.pgn.StringExporter(headers=True, variations=True, comments=True)
+            return game.accept(exporter)
 
         except Exception as e:
             print(f"Error adding analysis to PGN: {e}")
@@ -253,10 +248,8 @@ class StudyGenerator:
                           f"Win rate: {win_rate:.1f}%")
 
             # Convert back to PGN
-            output = StringIO()
-            exporter = chess.pgn.FileExporter(output)
-            game.accept(exporter)
-            return output.getvalue()
+            exporter = chess.pgn.StringExporter(headers=True, variations=True, comments=True)
+            return game.accept(exporter)
 
         except Exception:
             return pgn
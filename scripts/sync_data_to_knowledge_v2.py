@@ -8,6 +8,8 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 
+from analysis_store import AnalysisStore, pgn_key
+
 def sync_all_data_to_knowledge():
     """Copy ALL game data to knowledge directory for full analysis"""
 
@@ -22,6 +24,7 @@ def sync_all_data_to_knowledge():
 
     # 1. Copy FULL games cache (ALL games with PGN)
     games_src = data_dir / "games_cache.json"
+    games_data = {}
     if games_src.exists():
         games_dst = knowledge_dir / "games_all.json"
         shutil.copy2(games_src, games_dst)
@@ -104,6 +107,24 @@ def sync_all_data_to_knowledge():
             size_kb = src.stat().st_size / 1024
             print(f"  ✅ Copied {filename}: {description} ({size_kb:.1f} KB)")
 
+    # On-demand analyses now live in SQLite, keyed by PGN; export them
+    # under their game URLs in the JSON layout
+    analysis_db = data_dir / "analysis.db"
+    if analysis_db.exists():
+        urls = {
+            pgn_key(game["pgn"]): game.get("url", "")
+            for game in games_data.get("games", [])
+            if game.get("pgn")
+        }
+        store = AnalysisStore(analysis_db)
+        analyses = store.export(urls)
+        store.close()
+        if analyses:
+            dst = knowledge_dir / "detailed_analysis_cache.json"
+            with open(dst, 'w') as f:
+                json.dump(analyses, f, indent=2)
+            print(f"  ✅ Exported detailed_analysis_cache.json: {len(analyses)} analyzed games")
+
     # 3. Create comprehensive patterns file
     analysis_src = data_dir / "analysis_results.json"
     if analysis_src.exists():
@@ -3,6 +3,7 @@
 Update coach memory after each session or periodically
 """
 
+import gzip
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -15,16 +16,34 @@ class CoachMemoryUpdater:
         self.session_dir = self.base_dir / "session_logs"
         self.data_dir = Path(__file__).parent.parent / "data"
 
+    def _gz_path(self, file_path: Path) -> Path:
+        """The .json.gz form of a file, written by initialize_coach_memory.py --gzip"""
+        return file_path.with_name(file_path.name + ".gz")
+
     def load_json(self, file_path: Path) -> Dict:
-        """Load JSON file"""
+        """Load JSON file, or its .json.gz form if only that exists"""
         if file_path.exists():
             with open(file_path, 'r') as f:
                 return json.load(f)
+        gz_path = self._gz_path(file_path)
+        if gz_path.exists():
+            with gzip.open(gz_path, 'rt') as f:
+                return json.load(f)
         return {}
 
     def save_json(self, data: Dict, file_path: Path):
-        """Save JSON file"""
-        with open(file_path, 'w') as f:
+        """Save JSON file, in the same plain or .json.gz form load_json reads"""
+        gz_path = self._gz_path(file_path)
+        if not file_path.exists() and gz_path.exists():
+            # Keep gzip-compressed memory compressed, so it never goes stale
+            with gzip.open(gz_path, 'wt', compresslevel=1) as f:
+                json.dump(data, f, indent=2)
+            return
+
+        # json.dump encodes incrementally, so the growing session and history
+        # lists are never held as one big string; the 1 MiB buffer batches
+        # its many small chunk writes into few syscalls
+        with open(file_path, 'w', buffering=1 << 20) as f:
             json.dump(data, f, indent=2)
 
     def check_new_games(self, since_date: Optional[str] = None) -> List[Dict]:
@@ -0,0 +1,80 @@
+"""Tests for importing and exporting the on-demand analysis cache."""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from analysis_store import AnalysisStore, pgn_key  # noqa: E402
+from analyze_game_on_demand import OnDemandAnalyzer  # noqa: E402
+
+PGN = '[Event "Test"]\n[Result "*"]\n\n1. e4 e5 2. Nf3 *'
+URL = "https://www.chess.com/game/live/1"
+
+
+def _analysis(depth):
+    return {
+        "analysis": [],
+        "accuracy": 90.0,
+        "total_moves": 3,
+        "blunders": 0,
+        "mistakes": 0,
+        "inaccuracies": 0,
+        "good_moves": 3,
+        "engine_depth": depth,
+    }
+
+
+def _write_data(tmp_path, legacy):
+    data = tmp_path / "data"
+    data.mkdir()
+    games = {"games": [{"url": URL, "pgn": PGN, "end_time": 0,
+                        "white": {"username": "a"}, "black": {"username": "b"}}]}
+    (data / "games_cache.json").write_text(json.dumps(games))
+    (data / "detailed_analysis_cache.json").write_text(json.dumps(legacy))
+
+
+def test_import_baseline_cache_skips_errors(tmp_path, monkeypatch):
+    # Original layout: keyed by game URL, failures cached as {"error": ...}
+    _write_data(tmp_path, {
+        URL: _analysis(20),
+        "https://www.chess.com/game/live/2": {"error": "Invalid PGN"},
+        "https://www.chess.com/game/live/3": _analysis(18),  # Game no longer cached
+    })
+    monkeypatch.chdir(tmp_path)
+
+    with OnDemandAnalyzer() as analyzer:
+        assert len(analyzer.analysis_store) == 1
+        assert analyzer.analysis_store.get(pgn_key(PGN), 20) == _analysis(20)
+
+    # Leaving the context manager closes the database
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(analyzer.analysis_store)
+
+
+def test_import_depth_keyed_cache(tmp_path, monkeypatch):
+    _write_data(tmp_path, {
+        pgn_key(PGN): {"16": _analysis(16), "20": _analysis(20)},
+        "bad": {"18": {"error": "Invalid PGN"}},
+    })
+    monkeypatch.chdir(tmp_path)
+
+    with OnDemandAnalyzer() as analyzer:
+        assert len(analyzer.analysis_store) == 2
+        assert analyzer.analysis_store.get(pgn_key(PGN), 17) == _analysis(20)
+
+
+def test_export_is_keyed_by_url(tmp_path):
+    store = AnalysisStore(tmp_path / "analysis.db")
+    store.put_many([
+        (pgn_key(PGN), 16, _analysis(16)),
+        (pgn_key(PGN), 20, _analysis(20)),
+        ("unknown", 20, _analysis(20)),
+    ])
+
+    assert store.export({pgn_key(PGN): URL}) == {URL: _analysis(20)}
+    store.close()